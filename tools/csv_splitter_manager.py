@@ -2,6 +2,9 @@
 # -*- coding: utf-8 -*-
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 import os
 from tqdm import tqdm
 import sys
@@ -11,34 +14,109 @@ import random
 from datetime import datetime
 import psutil
 import gc
-from typing import List
+import mmap
+import threading
+import queue
+import shutil
+import shlex
+import subprocess
+import signal
+import tempfile
+import csv
+import io
+import itertools
+from collections import deque, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Optional, Tuple
+import numpy as np
+
+try:
+    import numba  # 可选依赖，用于加速行边界扫描
+except ImportError:
+    numba = None
+
+try:
+    import zstandard  # 可选依赖，用于 --compress zstd
+except ImportError:
+    zstandard = None
+
+try:
+    import resource  # Windows下不可用，回退到psutil
+except ImportError:
+    resource = None
 
 # 性能优化配置
 MEMORY_CHECK_INTERVAL = 100 * 1024 * 1024  # 每处理100MB检查一次内存
 MEMORY_THRESHOLD = 80  # 内存使用率警告阈值（百分数）
+GC_RSS_GROWTH = 256 * 1024 * 1024  # 内存峰值增长超过256MB时才执行垃圾回收
 BATCH_SIZE = 10000  # 默认批处理大小
 BUFFER_SIZE = 8192 * 1024  # 8MB文件缓冲区大小
-ENCODING = 'utf-8-sig'  # 统一使用的编码
+ENCODING = 'utf-8-sig'  # 读取时使用的编码（自动去除文件开头的BOM）
+OUTPUT_ENCODING = 'utf-8'  # 写入时使用的编码，BOM由open_output在文件开头单独写入
+WORKERS = min(4, os.cpu_count() or 1)  # 并行解析日期的工作进程数
+MAX_OPEN_FILES = 500  # 按日期分割时同时保持打开的输出文件上限
+SAMPLE_SIZE = 4 * 1024 * 1024  # 估算行大小时读取的样本字节数
+PIPELINE_QUEUE_SIZE = 4  # 流水线各阶段之间的队列长度
+WRITE_BUFFER_BYTES = 64 * 1024 * 1024  # 输出数据累积到64MB后再统一写出
+ARROW_BLOCK_SIZE = 64 * 1024 * 1024  # Arrow CSV读取器每次解析的数据块大小
+CSV_WRITE_BATCH_SIZE = 65536  # 写出CSV时每次转换为Python对象并格式化的行数
+ZSTD_LEVEL = 3  # zstd压缩级别
+UTF8_BOM = b'\xef\xbb\xbf'
+# Linux下os.sendfile支持文件到文件的零拷贝复制，其他平台回退到分块读写
+HAS_SENDFILE = hasattr(os, 'sendfile') and sys.platform.startswith('linux')
+
+@dataclass(frozen=True)
+class Config:
+    """运行参数，由命令行参数构造后显式传给各个分割函数"""
+    batch_size: int = BATCH_SIZE
+    memory_threshold: int = MEMORY_THRESHOLD
+    buffer_size: int = BUFFER_SIZE
+    workers: int = WORKERS
+    use_coreutils: bool = True  # POSIX系统上无需删除列时使用coreutils的split/head/tail
+    compression: Optional[str] = None  # 输出压缩方式，为'zstd'时输出文件名追加.zst
+
+_PROCESS = psutil.Process(os.getpid())
+_TOTAL_MEMORY = psutil.virtual_memory().total
+_last_gc_rss = 0
 
 def get_memory_usage():
-    """获取当前进程的内存使用情况"""
-    process = psutil.Process(os.getpid())
-    memory_info = process.memory_info()
-    total_memory = psutil.virtual_memory().total / (1024 * 1024)  # MB
-    memory_percent = (memory_info.rss / (total_memory * 1024 * 1024)) * 100
-    return memory_info.rss / (1024 * 1024), memory_percent
-
-def check_memory_usage():
-    """检查内存使用情况，如果超过阈值则发出警告并执行垃圾回收"""
+    """获取当前进程的内存使用情况
+
+    优先使用resource.getrusage（一次系统调用，返回内存峰值），
+    不可用时回退到psutil读取当前RSS。
+    """
+    if resource is not None:
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss在Linux上以KB为单位，在macOS上以字节为单位
+        if sys.platform != 'darwin':
+            rss *= 1024
+    else:
+        rss = _PROCESS.memory_info().rss
+    return rss / (1024 * 1024), rss / _TOTAL_MEMORY * 100
+
+def check_memory_usage(memory_threshold: int = MEMORY_THRESHOLD):
+    """检查内存使用情况，超过阈值时发出警告，内存明显增长时执行一次年轻代垃圾回收"""
+    global _last_gc_rss
     memory_usage, memory_percent = get_memory_usage()
-    if memory_percent > MEMORY_THRESHOLD:
+    if memory_percent > memory_threshold:
         print(f"警告：内存使用超过阈值: {memory_usage:.2f}MB ({memory_percent:.1f}%)")
-        gc.collect()
+    
+    rss = memory_usage * 1024 * 1024
+    if rss - _last_gc_rss > GC_RSS_GROWTH:
+        gc.collect(0)
+        _last_gc_rss = rss
     return memory_usage, memory_percent
 
 def get_total_rows(file_path: str) -> int:
-    """获取CSV文件的总行数（不包括标题行）"""
-    return sum(1 for _ in open(file_path, 'r', encoding=ENCODING)) - 1
+    """获取CSV文件的总行数（不包括标题行，引号字段内的换行不计入）"""
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return 0
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            _, data_start = _read_header(mm)
+            return _scan_rows(mm, data_start)[0]
 
 def process_chunk(chunk: pd.DataFrame, columns_to_drop: List[str] = None) -> pd.DataFrame:
     """处理数据块的通用函数"""
@@ -46,15 +124,216 @@ def process_chunk(chunk: pd.DataFrame, columns_to_drop: List[str] = None) -> pd.
         chunk = chunk.drop(columns=columns_to_drop)
     return chunk
 
-def write_chunk(chunk: pd.DataFrame, output_file: str, mode: str = 'w', header: bool = True):
-    """写入数据块的通用函数"""
-    chunk.to_csv(output_file, mode=mode, index=False, header=header, encoding=ENCODING)
+def open_output(output_file: str, mode: str = 'w', buffering: int = -1, compression: Optional[str] = None):
+    """以二进制方式打开输出文件，新建文件时在开头写入一次BOM
+    
+    启用zstd压缩时文件名追加.zst，返回多线程压缩的流式写入对象，
+    追加模式下写入新的zstd帧。
+    """
+    if compression == 'zstd':
+        raw = open(output_file + '.zst', mode + 'b', buffering=buffering)
+        handle = zstandard.ZstdCompressor(level=ZSTD_LEVEL, threads=-1).stream_writer(raw)
+    else:
+        handle = open(output_file, mode + 'b', buffering=buffering)
+    if mode == 'w':
+        handle.write(UTF8_BOM)
+    return handle
+
+def open_arrow_reader(input_file: str, source=None):
+    """以流式方式打开CSV文件，所有列按字符串读取，原样保留字段内容
+
+    不做类型推断，数据块由Arrow的多线程解析器并行切分解析，
+    适用于只需复制、分割或删除列的场景。source为已打开的输入流（用于跟踪读取进度）。
+    """
+    with open(input_file, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            header, data_start = _read_header(mm)
+            header_only = data_start >= len(mm)
+    # 列名取Arrow自己解析标题行的结果（空列名、重名列保持原样），而不是pandas改写后的列名
+    # 只解析一行，不启用多线程
+    columns = pacsv.read_csv(pa.py_buffer(header),
+                             read_options=pacsv.ReadOptions(use_threads=False),
+                             parse_options=pacsv.ParseOptions(newlines_in_values=True)).column_names
+    if header_only:
+        # 只有标题行时（末尾没有换行符时Arrow无法解析）不读取文件，返回没有数据的读取器
+        return pa.RecordBatchReader.from_batches(pa.schema([(col, pa.string()) for col in columns]), [])
+    return pacsv.open_csv(
+        source if source is not None else input_file,
+        read_options=pacsv.ReadOptions(use_threads=True, block_size=ARROW_BLOCK_SIZE),
+        parse_options=pacsv.ParseOptions(newlines_in_values=True),
+        convert_options=pacsv.ConvertOptions(column_types={col: pa.string() for col in columns}))
+
+class ArrowCsvWriter:
+    """把Arrow数据块写为CSV输出文件，文件开头写入一次BOM
+    
+    字段用csv.writer按需加引号，与pandas的to_csv一致（Arrow的CSV写入器会给所有字符串加引号）。
+    小批量数据先累积在内存中，达到WRITE_BUFFER_BYTES后合并写出，每次格式化CSV_WRITE_BATCH_SIZE行，
+    输出文件使用buffer_size大小的缓冲区，使系统调用以大块写入为主。
+    """
+    
+    def __init__(self, output_file: str, schema: pa.Schema, cfg: Config = Config()):
+        self.sink = open_output(output_file, buffering=cfg.buffer_size, compression=cfg.compression)
+        self.pending = []
+        self.pending_bytes = 0
+        self._write_rows([schema.names])
+    
+    def _write_rows(self, rows):
+        text = io.StringIO()
+        # 行尾与pandas的to_csv一致
+        csv.writer(text, lineterminator=os.linesep).writerows(rows)
+        self.sink.write(text.getvalue().encode(OUTPUT_ENCODING))
+    
+    def write_batch(self, batch):
+        self.pending.append(batch)
+        self.pending_bytes += batch.nbytes
+        if self.pending_bytes >= WRITE_BUFFER_BYTES:
+            self.flush()
+    
+    def flush(self):
+        if self.pending:
+            table = pa.Table.from_batches(self.pending)
+            for batch in table.to_batches(max_chunksize=CSV_WRITE_BATCH_SIZE):
+                self._write_rows(zip(*(column.to_pylist() for column in batch.columns)))
+            self.pending = []
+            self.pending_bytes = 0
+    
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            self.sink.close()
+
+class ByteProgress:
+    """按输入文件已读取的字节数显示进度，无需预先扫描统计行数"""
+    
+    def __init__(self, input_file: str, desc: str):
+        self.source = pa.OSFile(input_file)
+        self.pbar = tqdm(total=os.path.getsize(input_file), unit='B', unit_scale=True, desc=desc)
+        self.position = 0
+    
+    def update(self):
+        position = self.source.tell()
+        self.pbar.update(position - self.position)
+        self.position = position
+    
+    def close(self):
+        self.pbar.update(self.pbar.total - self.position)
+        self.pbar.close()
+        self.source.close()
+
+def select_columns(schema: pa.Schema, columns_to_drop: List[str] = None):
+    """返回保留列的下标及对应的schema"""
+    drop_set = set(columns_to_drop or [])
+    keep_idx = [i for i, name in enumerate(schema.names) if name not in drop_set]
+    return keep_idx, pa.schema([schema.field(i) for i in keep_idx])
+
+def get_transform_workers() -> int:
+    """自由线程（无GIL）的Python上使用多个转换线程，否则只使用一个"""
+    if sys.version_info >= (3, 13) and not sys._is_gil_enabled():
+        return max(1, (os.cpu_count() or 2) // 2)
+    return 1
+
+_PIPELINE_END = object()
+
+def run_pipeline(batches, transform, sink, workers: int = 1):
+    """读取 → 转换 → 写入 三段流水线
+
+    读取和转换在后台线程中执行，写入在当前线程按原始顺序执行。
+    队列有界，写入跟不上时读取会自动等待。sink返回True时提前结束。
+    """
+    read_q = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    write_q = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    stop = threading.Event()
+    errors = []
+    
+    def put(q, item):
+        # 带超时的put，避免下游提前结束后线程一直阻塞
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def get(q):
+        while not stop.is_set():
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return _PIPELINE_END
+    
+    def reader():
+        try:
+            for seq, batch in enumerate(batches):
+                if not put(read_q, (seq, batch)):
+                    return
+        except Exception as e:
+            errors.append(e)
+        finally:
+            for _ in range(workers):
+                put(read_q, _PIPELINE_END)
+    
+    def transformer():
+        try:
+            while True:
+                item = get(read_q)
+                if item is _PIPELINE_END:
+                    break
+                seq, batch = item
+                if not put(write_q, (seq, transform(batch))):
+                    return
+        except Exception as e:
+            errors.append(e)
+        finally:
+            put(write_q, _PIPELINE_END)
+    
+    threads = [threading.Thread(target=reader, daemon=True)]
+    threads += [threading.Thread(target=transformer, daemon=True) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    
+    # 多个转换线程可能乱序完成，按序号重排后再写入
+    pending = {}
+    next_seq = 0
+    finished = 0
+    try:
+        while finished < workers and not errors:
+            item = write_q.get()
+            if item is _PIPELINE_END:
+                finished += 1
+                continue
+            seq, batch = item
+            pending[seq] = batch
+            while next_seq in pending:
+                if sink(pending.pop(next_seq)):
+                    return
+                next_seq += 1
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+    
+    if errors:
+        raise errors[0]
+
+def is_parquet_file(file_path: str) -> bool:
+    """根据扩展名判断是否为Parquet文件"""
+    return file_path.lower().endswith('.parquet')
+
+@lru_cache(maxsize=32)
+def _get_csv_columns_cached(file_path: str, mtime: float, size: int) -> Tuple[str, ...]:
+    """按 (路径, 修改时间, 大小) 缓存列名，文件变化后自动重新读取"""
+    if is_parquet_file(file_path):
+        return tuple(pq.read_schema(file_path).names)
+    return tuple(pd.read_csv(file_path, nrows=0, encoding=ENCODING).columns)
 
 def get_csv_columns(file_path):
     """读取CSV文件的列名"""
     try:
-        df = pd.read_csv(file_path, nrows=0, encoding='utf-8-sig')
-        return list(df.columns)
+        stat = os.stat(file_path)
+        return list(_get_csv_columns_cached(file_path, stat.st_mtime, stat.st_size))
     except Exception as e:
         print(f"读取文件出错: {str(e)}")
         sys.exit(1)
@@ -75,76 +354,387 @@ def get_file_size(file_path):
     """获取文件大小（MB）"""
     return os.path.getsize(file_path) / (1024 * 1024)
 
-def split_by_rows(input_file: str, output_prefix: str, rows_per_file: int, columns_to_drop=None):
+if numba is not None:
+    @numba.njit(cache=True, boundscheck=False)
+    def _find_row_end(buf, row_start, pos):
+        """从行首row_start开始扫描，返回pos之后第一个不在引号内的换行符之后的偏移"""
+        in_quote = False
+        for i in range(row_start, buf.shape[0]):
+            c = buf[i]
+            if c == 34:  # "
+                in_quote = not in_quote
+            elif c == 10 and not in_quote and i >= pos:  # \n
+                return i + 1
+        return buf.shape[0]
+
+def _next_row_boundary(mm, row_start: int, pos: int) -> int:
+    """返回pos之后第一个行边界（换行符之后的偏移）
+
+    row_start必须是已知的行首，用于统计引号的奇偶性，
+    从而跳过引号字段内部的换行符。
+    """
+    size = len(mm)
+    if pos >= size:
+        return size
+    # 区间内没有引号时无需统计奇偶性，直接按换行符切分
+    newline = mm.find(b'\n', pos)
+    if newline == -1:
+        return size
+    if mm.find(b'"', row_start, newline) == -1:
+        return newline + 1
+    # 存在引号时优先使用numba编译的扫描函数，避免把数据切片复制到Python中统计
+    if numba is not None:
+        return int(_find_row_end(np.frombuffer(mm, dtype=np.uint8), row_start, pos))
+    quotes = 0
+    if mm.find(b'"', row_start, pos) != -1:
+        quotes = mm[row_start:pos].count(b'"')
+    while True:
+        newline = mm.find(b'\n', pos)
+        if newline == -1:
+            return size
+        if mm.find(b'"', pos, newline) != -1:
+            quotes += mm[pos:newline].count(b'"')
+        if quotes % 2 == 0:
+            return newline + 1
+        pos = newline + 1
+
+if numba is not None:
+    @numba.njit(cache=True, boundscheck=False)
+    def _scan_row_ends(buf, start, max_rows):
+        """从行首start开始统计不在引号内的换行符，返回 (行数, 最后一行结束的偏移)"""
+        in_quote = False
+        count = 0
+        end = start
+        for i in range(start, buf.shape[0]):
+            c = buf[i]
+            if c == 34:  # "
+                in_quote = not in_quote
+            elif c == 10 and not in_quote:  # \n
+                count += 1
+                end = i + 1
+                if count == max_rows:
+                    break
+        return count, end
+
+def _count_newlines(mm, start: int, max_rows: int, block_size: int = BUFFER_SIZE) -> Tuple[int, int]:
+    """不含引号时按块统计换行符，返回 (行数, 最后一行结束的偏移)"""
+    rows = 0
+    end = start
+    for offset in range(start, len(mm), block_size):
+        block = mm[offset:offset + block_size]
+        count = block.count(b'\n')
+        if max_rows >= 0 and rows + count >= max_rows:
+            # 在当前块内定位第max_rows行的结束位置
+            pos = -1
+            for _ in range(max_rows - rows):
+                pos = block.find(b'\n', pos + 1)
+            return max_rows, offset + pos + 1
+        rows += count
+        if count:
+            end = offset + block.rfind(b'\n') + 1
+    return rows, end
+
+def _scan_rows(mm, start: int, max_rows: int = -1) -> Tuple[int, int]:
+    """从行首start开始按行扫描，跳过引号字段内的换行符
+
+    返回 (行数, 最后一行结束的偏移)。max_rows为-1时扫描到文件末尾，
+    末尾没有换行符的最后一行也计入行数。
+    """
+    if max_rows == 0:
+        return 0, start
+    if mm.find(b'"', start) == -1:
+        rows, end = _count_newlines(mm, start, max_rows)
+    elif numba is not None:
+        rows, end = _scan_row_ends(np.frombuffer(mm, dtype=np.uint8), start, max_rows)
+        rows, end = int(rows), int(end)
+    else:
+        rows = 0
+        end = pos = start
+        quotes = 0
+        while rows != max_rows:
+            newline = mm.find(b'\n', pos)
+            if newline == -1:
+                break
+            if mm.find(b'"', pos, newline) != -1:
+                quotes += mm[pos:newline].count(b'"')
+            pos = newline + 1
+            if quotes % 2 == 0:
+                rows += 1
+                end = pos
+    
+    if rows != max_rows and end < len(mm):
+        rows += 1
+        end = len(mm)
+    return rows, end
+
+def _read_header(mm) -> Tuple[bytes, int]:
+    """读取标题行，返回去除BOM后的标题字节及数据区起始偏移"""
+    header_end = _next_row_boundary(mm, 0, 0)
+    header = mm[:header_end]
+    if header.startswith(UTF8_BOM):
+        header = header[len(UTF8_BOM):]
+    if not header.endswith(b'\n'):
+        header += b'\n'
+    return header, header_end
+
+def _plan_byte_ranges(mm, data_start: int, bytes_per_file: int) -> List[Tuple[int, int]]:
+    """按目标字节数规划分割区间，每个区间的边界都对齐到行边界"""
+    ranges = []
+    start = data_start
+    size = len(mm)
+    while start < size:
+        end = _next_row_boundary(mm, start, start + bytes_per_file)
+        ranges.append((start, end - start))
+        start = end
+    return ranges
+
+def _write_all(fd: int, data: bytes):
+    """向文件描述符写入全部数据"""
+    view = memoryview(data)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
+
+def _copy_range(in_fd: int, out_fd: int, offset: int, length: int, buffer_size: int = BUFFER_SIZE):
+    """将输入文件的指定字节区间复制到输出文件"""
+    if HAS_SENDFILE:
+        while length > 0:
+            sent = os.sendfile(out_fd, in_fd, offset, length)
+            if sent == 0:
+                break
+            offset += sent
+            length -= sent
+        return
+    
+    os.lseek(in_fd, offset, os.SEEK_SET)
+    while length > 0:
+        data = os.read(in_fd, min(buffer_size, length))
+        if not data:
+            break
+        _write_all(out_fd, data)
+        length -= len(data)
+
+def _sendfile_split(input_path: str, ranges: List[Tuple[int, int]], outputs: List[str], header: bytes = b'', pbar=None,
+                    buffer_size: int = BUFFER_SIZE):
+    """按字节区间将输入文件直接复制到各输出文件，每个输出文件先写入标题行"""
+    binary_flag = getattr(os, 'O_BINARY', 0)
+    in_fd = os.open(input_path, os.O_RDONLY | binary_flag)
+    try:
+        for (offset, length), output_file in zip(ranges, outputs):
+            out_fd = os.open(output_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | binary_flag, 0o644)
+            try:
+                if header:
+                    _write_all(out_fd, header)
+                _copy_range(in_fd, out_fd, offset, length, buffer_size)
+            finally:
+                os.close(out_fd)
+            if pbar is not None:
+                pbar.update(length)
+    finally:
+        os.close(in_fd)
+
+def can_use_coreutils(cfg: Config, input_file: str) -> bool:
+    """判断是否可以交给GNU coreutils按行处理
+
+    需要POSIX系统上的GNU split/head/tail，且输入文件不含引号
+    （否则引号字段中可能存在换行符，无法按物理行切分）。
+    """
+    if not cfg.use_coreutils or cfg.compression is not None or os.name != 'posix':
+        return False
+    if not all(shutil.which(tool) for tool in ('split', 'head', 'tail')):
+        return False
+    # --filter等参数为GNU split特有
+    if subprocess.run(['split', '--version'], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL).returncode != 0:
+        return False
+    with open(input_file, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return False
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return mm.find(b'"') == -1
+
+def _read_header_bytes(input_file: str) -> bytes:
+    """读取去除BOM后的标题行字节"""
+    with open(input_file, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return _read_header(mm)[0]
+
+def coreutils_split_rows(input_file: str, output_prefix: str, rows_per_file: int) -> int:
+    """使用 tail | split 按行数分割，每个输出文件由split的--filter写入标题行，返回生成的文件数"""
+    header = UTF8_BOM + _read_header_bytes(input_file)
+    with tempfile.NamedTemporaryFile(suffix='.csv', delete=False) as header_file:
+        header_file.write(header)
+    
+    tmp_prefix = f"{output_prefix}_coreutils_"
+    try:
+        tail = subprocess.Popen(['tail', '-n', '+2', input_file], stdout=subprocess.PIPE)
+        subprocess.run(
+            ['split', '-l', str(rows_per_file), '-a', '6', '--numeric-suffixes=1',
+             f'--filter=cat {shlex.quote(header_file.name)} - > "$FILE"', '-', tmp_prefix],
+            stdin=tail.stdout, check=True)
+        tail.stdout.close()
+        if tail.wait() != 0:
+            raise RuntimeError(f"tail 执行失败，返回码 {tail.returncode}")
+    finally:
+        os.unlink(header_file.name)
+    
+    # 将split生成的文件重命名为与Python实现一致的文件名
+    total_files = 0
+    while os.path.exists(f"{tmp_prefix}{total_files + 1:06d}"):
+        total_files += 1
+        os.replace(f"{tmp_prefix}{total_files:06d}", f"{output_prefix}_{total_files}.csv")
+    return total_files
+
+def coreutils_top_n(input_file: str, output_file: str, top_n: int) -> int:
+    """使用 tail | head 截取前N条记录，返回实际写出的记录数"""
+    with open_output(output_file) as out:
+        out.write(_read_header_bytes(input_file))
+        out.flush()
+        tail = subprocess.Popen(['tail', '-n', '+2', input_file], stdout=subprocess.PIPE)
+        subprocess.run(['head', '-n', str(top_n)], stdin=tail.stdout, stdout=out, check=True)
+        tail.stdout.close()
+        # head取够N行后提前退出，tail随后写入时被SIGPIPE终止属于正常情况
+        if tail.wait() not in (0, -signal.SIGPIPE):
+            raise RuntimeError(f"tail 执行失败，返回码 {tail.returncode}")
+    # 输入不含引号，输出文件的物理行数即为记录数
+    return get_total_rows(output_file)
+
+def split_by_byte_ranges(cfg: Config, input_file: str, output_prefix: str, bytes_per_file: int) -> int:
+    """按字节数分割CSV文件（不解析数据，直接复制原始字节），返回生成的文件数"""
+    with open(input_file, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return 0
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            header, data_start = _read_header(mm)
+            ranges = _plan_byte_ranges(mm, data_start, bytes_per_file)
+    
+    outputs = [f"{output_prefix}_{i+1}.csv" for i in range(len(ranges))]
+    pbar = tqdm(total=sum(length for _, length in ranges), unit='B', unit_scale=True, desc="分割进度")
+    _sendfile_split(input_file, ranges, outputs, UTF8_BOM + header, pbar, cfg.buffer_size)
+    pbar.close()
+    return len(outputs)
+
+def split_by_rows(cfg: Config, input_file: str, output_prefix: str, rows_per_file: int, columns_to_drop=None):
     """按行数分割CSV文件"""
     try:
-        total_rows = get_total_rows(input_file)
-        total_files = (total_rows + rows_per_file - 1) // rows_per_file
-        
-        print(f"总行数: {total_rows}, 将分割成 {total_files} 个文件，每个文件 {rows_per_file} 行")
-        pbar = tqdm(total=total_rows, desc="分割进度")
+        if rows_per_file < 1:
+            raise ValueError(f"每个文件的行数必须至少为1，当前为 {rows_per_file}")
+        if not columns_to_drop and can_use_coreutils(cfg, input_file):
+            print(f"使用 coreutils 分割，每个文件 {rows_per_file} 行")
+            total_files = coreutils_split_rows(input_file, output_prefix, rows_per_file)
+            print(f"\n分割完成！已生成 {total_files} 个文件")
+            return
         
-        current_file = 0
-        processed_bytes = 0
+        print(f"每个文件 {rows_per_file} 行")
+        progress = ByteProgress(input_file, "分割进度")
+        reader = open_arrow_reader(input_file, progress.source)
+        keep_idx, schema = select_columns(reader.schema, columns_to_drop)
+        memory_threshold = cfg.memory_threshold
+        state = {'writer': None, 'file': 0, 'rows': 0, 'bytes': 0}
         
-        for chunk in pd.read_csv(input_file, chunksize=min(BATCH_SIZE, rows_per_file), encoding=ENCODING):
-            chunk = process_chunk(chunk, columns_to_drop)
-            output_file = f"{output_prefix}_{current_file+1}.csv"
-            write_chunk(chunk, output_file)
-            
-            chunk_size = len(chunk)
-            processed_bytes += chunk.memory_usage(deep=True).sum()
-            pbar.update(chunk_size)
-            current_file += 1
+        def write_batch(batch):
+            offset = 0
+            while offset < batch.num_rows:
+                if state['writer'] is None or state['rows'] >= rows_per_file:
+                    if state['writer'] is not None:
+                        state['writer'].close()
+                    state['file'] += 1
+                    state['writer'] = ArrowCsvWriter(f"{output_prefix}_{state['file']}.csv", schema, cfg)
+                    state['rows'] = 0
+                rows = min(rows_per_file - state['rows'], batch.num_rows - offset)
+                state['writer'].write_batch(batch.slice(offset, rows))
+                state['rows'] += rows
+                offset += rows
             
-            if processed_bytes >= MEMORY_CHECK_INTERVAL:
-                check_memory_usage()
-                processed_bytes = 0
+            progress.update()
+            state['bytes'] += batch.nbytes
+            if state['bytes'] >= MEMORY_CHECK_INTERVAL:
+                check_memory_usage(memory_threshold)
+                state['bytes'] = 0
         
-        pbar.close()
-        print(f"\n分割完成！已生成 {current_file} 个文件")
+        try:
+            run_pipeline(reader, lambda batch: batch.select(keep_idx), write_batch, get_transform_workers())
+        finally:
+            if state['writer'] is not None:
+                state['writer'].close()
+        
+        progress.close()
+        print(f"\n分割完成！已生成 {state['file']} 个文件")
         
     except Exception as e:
         print(f"分割文件时出错: {str(e)}")
         sys.exit(1)
 
-def split_by_percentage(input_file: str, output_prefix: str, percentage: float, columns_to_drop=None):
+def split_percentage_by_bytes(cfg: Config, input_file: str, output_prefix: str, percentage: float):
+    """按百分比分割CSV文件（不解析数据，定位分界行后直接复制两段原始字节）"""
+    with open(input_file, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            header, data_start = _read_header(mm)
+            total_rows, data_end = _scan_rows(mm, data_start)
+            first_part_rows = int(total_rows * (percentage / 100))
+            _, boundary = _scan_rows(mm, data_start, first_part_rows)
+    
+    print(f"总行数: {total_rows}, 将分割成 {percentage}% ({first_part_rows}行) 和 {100-percentage}% ({total_rows-first_part_rows}行)")
+    pbar = tqdm(total=data_end - data_start, unit='B', unit_scale=True, desc="分割进度")
+    _sendfile_split(
+        input_file,
+        [(data_start, boundary - data_start), (boundary, data_end - boundary)],
+        [f"{output_prefix}_part1.csv", f"{output_prefix}_part2.csv"],
+        UTF8_BOM + header, pbar, cfg.buffer_size)
+    pbar.close()
+
+def split_by_percentage(cfg: Config, input_file: str, output_prefix: str, percentage: float, columns_to_drop=None):
     """按百分比分割CSV文件"""
     try:
+        # 不需要删除列且不压缩时直接复制原始字节
+        if not columns_to_drop and cfg.compression is None and os.path.getsize(input_file) > 0:
+            split_percentage_by_bytes(cfg, input_file, output_prefix, percentage)
+            print(f"\n分割完成！文件已保存为 {output_prefix}_part1.csv 和 {output_prefix}_part2.csv")
+            return
+        
         total_rows = get_total_rows(input_file)
         first_part_rows = int(total_rows * (percentage / 100))
         
         print(f"总行数: {total_rows}, 将分割成 {percentage}% ({first_part_rows}行) 和 {100-percentage}% ({total_rows-first_part_rows}行)")
         pbar = tqdm(total=total_rows, desc="分割进度")
         
-        current_row = 0
-        processed_bytes = 0
+        reader = open_arrow_reader(input_file)
+        keep_idx, schema = select_columns(reader.schema, columns_to_drop)
+        first_writer = ArrowCsvWriter(f"{output_prefix}_part1.csv", schema, cfg)
+        second_writer = ArrowCsvWriter(f"{output_prefix}_part2.csv", schema, cfg)
+        batches = (batch.select(keep_idx) for batch in reader)
+        memory_threshold = cfg.memory_threshold
+        state = {'bytes': 0}
         
-        for chunk in pd.read_csv(input_file, chunksize=min(BATCH_SIZE, first_part_rows), encoding=ENCODING):
-            chunk = process_chunk(chunk, columns_to_drop)
-            chunk_size = len(chunk)
-            
-            # 处理第一个文件
-            if current_row < first_part_rows:
-                rows_for_first = min(chunk_size, first_part_rows - current_row)
-                first_part = chunk.iloc[:rows_for_first]
-                mode = 'a' if current_row > 0 else 'w'
-                write_chunk(first_part, f"{output_prefix}_part1.csv", mode, header=(mode=='w'))
-            
-            # 处理第二个文件
-            if current_row + chunk_size > first_part_rows:
-                start_idx = max(0, first_part_rows - current_row)
-                second_part = chunk.iloc[start_idx:]
-                mode = 'a' if current_row > first_part_rows else 'w'
-                write_chunk(second_part, f"{output_prefix}_part2.csv", mode, header=(mode=='w'))
-            
-            current_row += chunk_size
-            processed_bytes += chunk.memory_usage(deep=True).sum()
-            pbar.update(chunk_size)
+        def advance(batch):
+            pbar.update(batch.num_rows)
+            state['bytes'] += batch.nbytes
+            if state['bytes'] >= MEMORY_CHECK_INTERVAL:
+                check_memory_usage(memory_threshold)
+                state['bytes'] = 0
+        
+        try:
+            # 第一阶段：完整属于第一个文件的数据块
+            current_row = 0
+            for batch in batches:
+                if current_row + batch.num_rows <= first_part_rows:
+                    first_writer.write_batch(batch)
+                else:
+                    # 第二阶段：跨越分界行的数据块
+                    split_at = first_part_rows - current_row
+                    first_writer.write_batch(batch.slice(0, split_at))
+                    second_writer.write_batch(batch.slice(split_at))
+                current_row += batch.num_rows
+                advance(batch)
+                if current_row >= first_part_rows:
+                    break
             
-            if processed_bytes >= MEMORY_CHECK_INTERVAL:
-                check_memory_usage()
-                processed_bytes = 0
+            # 第三阶段：剩余数据块全部属于第二个文件
+            for batch in batches:
+                second_writer.write_batch(batch)
+                advance(batch)
+        finally:
+            first_writer.close()
+            second_writer.close()
         
         pbar.close()
         print(f"\n分割完成！文件已保存为 {output_prefix}_part1.csv 和 {output_prefix}_part2.csv")
@@ -153,36 +743,100 @@ def split_by_percentage(input_file: str, output_prefix: str, percentage: float,
         print(f"分割文件时出错: {str(e)}")
         sys.exit(1)
 
-def split_by_date(input_file: str, output_prefix: str, date_column: str, date_format: str, columns_to_drop=None):
+def _parse_and_group(chunk: pd.DataFrame, date_column: str, date_format: str, columns_to_drop: List[str] = None):
+    """解析数据块的日期列并按月份分组，返回 (分组列表, 行数, 内存字节数)"""
+    chunk[date_column] = pd.to_datetime(chunk[date_column], format=date_format, cache=True)
+    periods = chunk[date_column].dt.to_period('M')
+    chunk = process_chunk(chunk, columns_to_drop)
+    groups = [(str(period), group) for period, group in chunk.groupby(periods)]
+    return groups, len(chunk), chunk.memory_usage(deep=True).sum()
+
+def _iter_date_groups(cfg: Config, input_file: str, date_column: str, date_format: str, columns_to_drop: List[str] = None):
+    """按读取顺序产出每个数据块的分组结果，日期解析和分组在进程池中并行执行"""
+    workers = cfg.workers
+    reader = pd.read_csv(input_file, chunksize=cfg.batch_size, encoding=ENCODING)
+    if workers <= 1:
+        for chunk in reader:
+            yield _parse_and_group(chunk, date_column, date_format, columns_to_drop)
+        return
+    
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # 限制在途任务数量，避免读取速度超过解析速度时占用过多内存
+        pending = deque()
+        for chunk in reader:
+            pending.append(pool.submit(_parse_and_group, chunk, date_column, date_format, columns_to_drop))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+class PeriodWriters:
+    """按月份维护输出文件句柄，每个文件只打开一次并只写入一次标题行
+    
+    打开的文件数超过MAX_OPEN_FILES时关闭最久未使用的文件，再次写入时以追加模式重新打开。
+    """
+    
+    def __init__(self, cfg: Config, output_prefix: str):
+        self.cfg = cfg
+        self.output_prefix = output_prefix
+        self.handles = OrderedDict()
+        self.started = set()
+    
+    def write(self, period: str, group: pd.DataFrame):
+        handle = self.handles.get(period)
+        if handle is None:
+            handle = self._open(period, group)
+        else:
+            self.handles.move_to_end(period)
+        group.to_csv(handle, mode='wb', index=False, header=False, encoding=OUTPUT_ENCODING)
+    
+    def _open(self, period: str, group: pd.DataFrame):
+        if len(self.handles) >= MAX_OPEN_FILES:
+            _, oldest = self.handles.popitem(last=False)
+            oldest.close()
+        
+        output_file = f"{self.output_prefix}_{period}.csv"
+        if period in self.started:
+            handle = open_output(output_file, 'a', self.cfg.buffer_size, self.cfg.compression)
+        else:
+            handle = open_output(output_file, 'w', self.cfg.buffer_size, self.cfg.compression)
+            group.head(0).to_csv(handle, mode='wb', index=False, encoding=OUTPUT_ENCODING)
+            self.started.add(period)
+        self.handles[period] = handle
+        return handle
+    
+    def close(self):
+        for handle in self.handles.values():
+            handle.close()
+        self.handles.clear()
+
+def split_by_date(cfg: Config, input_file: str, output_prefix: str, date_column: str, date_format: str, columns_to_drop=None):
     """按日期列分割CSV文件"""
     try:
         # 验证日期列是否存在
-        all_columns = pd.read_csv(input_file, nrows=0, encoding=ENCODING).columns
-        if date_column not in all_columns:
+        if date_column not in get_csv_columns(input_file):
             print(f"错误：日期列 '{date_column}' 不存在")
             sys.exit(1)
         
         print("读取数据并处理日期...")
         processed_bytes = 0
         total_rows = 0
+        writers = PeriodWriters(cfg, output_prefix)
         
-        for chunk in pd.read_csv(input_file, chunksize=BATCH_SIZE, encoding=ENCODING):
-            chunk[date_column] = pd.to_datetime(chunk[date_column], format=date_format)
-            chunk = process_chunk(chunk, columns_to_drop)
-            
-            for period, group in chunk.groupby(chunk[date_column].dt.to_period('M')):
-                output_file = f"{output_prefix}_{period}.csv"
-                mode = 'a' if os.path.exists(output_file) else 'w'
-                write_chunk(group, output_file, mode, header=(mode=='w'))
-            
-            chunk_size = len(chunk)
-            total_rows += chunk_size
-            processed_bytes += chunk.memory_usage(deep=True).sum()
-            
-            if processed_bytes >= MEMORY_CHECK_INTERVAL:
-                check_memory_usage()
-                processed_bytes = 0
-                print(f"已处理 {total_rows} 条记录")
+        try:
+            for groups, chunk_size, chunk_bytes in _iter_date_groups(cfg, input_file, date_column, date_format, columns_to_drop):
+                for period, group in groups:
+                    writers.write(period, group)
+                
+                total_rows += chunk_size
+                processed_bytes += chunk_bytes
+                
+                if processed_bytes >= MEMORY_CHECK_INTERVAL:
+                    check_memory_usage(cfg.memory_threshold)
+                    processed_bytes = 0
+                    print(f"已处理 {total_rows} 条记录")
+        finally:
+            writers.close()
         
         print(f"\n分割完成！文件已保存在输出目录中，共处理 {total_rows} 条记录")
         
@@ -190,91 +844,128 @@ def split_by_date(input_file: str, output_prefix: str, date_column: str, date_fo
         print(f"分割文件时出错: {str(e)}")
         sys.exit(1)
 
-def split_top_n(input_file, output_file, top_n, columns_to_drop=None):
+def split_top_n(cfg: Config, input_file, output_file, top_n, columns_to_drop=None):
     """截取CSV文件的前N条记录"""
     try:
-        # 读取总行数
-        total_rows = sum(1 for _ in open(input_file, 'r', encoding='utf-8-sig')) - 1
-        actual_rows = min(top_n, total_rows)
+        if not columns_to_drop and can_use_coreutils(cfg, input_file):
+            rows = coreutils_top_n(input_file, output_file, top_n)
+            print(f"\n处理完成！已截取前 {rows} 条记录并保存为: {output_file}")
+            return
         
-        print(f"总行数: {total_rows}, 将截取前 {actual_rows} 条记录")
-        pbar = tqdm(total=actual_rows, desc="处理进度")
+        # 只需截取前N条，进度条以N为总数，无需预先统计总行数
+        print(f"将截取前 {top_n} 条记录")
+        pbar = tqdm(total=top_n, desc="处理进度")
         
-        # 分块读取并处理
-        current_row = 0
-        processed_bytes = 0
-        first_chunk = True
+        reader = open_arrow_reader(input_file)
+        keep_idx, schema = select_columns(reader.schema, columns_to_drop)
+        writer = ArrowCsvWriter(output_file, schema, cfg)
+        state = {'rows': 0}
         
-        for chunk in pd.read_csv(input_file, chunksize=min(BATCH_SIZE, top_n), encoding='utf-8-sig'):
-            if current_row >= top_n:
-                break
-                
-            if columns_to_drop:
-                chunk = chunk.drop(columns=columns_to_drop)
-            
+        def write_batch(batch):
             # 计算本次需要保存的行数
-            rows_to_save = min(len(chunk), top_n - current_row)
-            chunk = chunk.iloc[:rows_to_save]
-            
-            # 保存数据
-            mode = 'w' if first_chunk else 'a'
-            header = first_chunk
-            chunk.to_csv(output_file, mode=mode, index=False, header=header, encoding='utf-8-sig')
-            
-            chunk_size = len(chunk)
-            current_row += chunk_size
-            processed_bytes += chunk.memory_usage(deep=True).sum()
-            pbar.update(chunk_size)
-            first_chunk = False
-            
-            # 定期检查内存使用情况
-            if processed_bytes >= MEMORY_CHECK_INTERVAL:
-                check_memory_usage()
-                processed_bytes = 0
-            
-            if current_row >= top_n:
-                break
+            rows_to_save = min(batch.num_rows, top_n - state['rows'])
+            writer.write_batch(batch.slice(0, rows_to_save))
+            state['rows'] += rows_to_save
+            pbar.update(rows_to_save)
+            return state['rows'] >= top_n
+        
+        try:
+            run_pipeline(reader, lambda batch: batch.select(keep_idx), write_batch, get_transform_workers())
+        finally:
+            writer.close()
         
         pbar.close()
-        print(f"\n处理完成！已截取前 {actual_rows} 条记录并保存为: {output_file}")
+        print(f"\n处理完成！已截取前 {state['rows']} 条记录并保存为: {output_file}")
         
     except Exception as e:
         print(f"处理文件时出错: {str(e)}")
         sys.exit(1)
 
-def split_by_size(input_file: str, output_prefix: str, size_per_file_mb: float, columns_to_drop=None):
+def estimate_row_size(input_file: str, columns_to_drop: List[str] = None) -> float:
+    """根据文件开头的原始字节估算每行数据的平均字节数（删除列后）"""
+    with open(input_file, 'rb') as f:
+        head = f.read(SAMPLE_SIZE)
+    
+    # 只统计完整的行，并排除标题行
+    last_newline = head.rfind(b'\n')
+    if last_newline != -1:
+        head = head[:last_newline + 1]
+    header_end = head.find(b'\n') + 1
+    data = head[header_end:] if header_end else head
+    avg_row_size = len(data) / max(data.count(b'\n'), 1)
+    
+    if columns_to_drop and data:
+        # 用前1000行估算被删除列所占的字节比例
+        reader = csv.reader(io.StringIO(head.decode(ENCODING, errors='ignore')))
+        header = next(reader)
+        drop_set = set(columns_to_drop)
+        drop_idx = [i for i, col in enumerate(header) if col in drop_set]
+        total_chars = dropped_chars = 0
+        for row in itertools.islice(reader, 1000):
+            total_chars += sum(len(field) + 1 for field in row)
+            dropped_chars += sum(len(row[i]) + 1 for i in drop_idx if i < len(row))
+        if total_chars:
+            avg_row_size *= 1 - dropped_chars / total_chars
+    
+    return max(avg_row_size, 1.0)
+
+def split_by_size(cfg: Config, input_file: str, output_prefix: str, size_per_file_mb: float, columns_to_drop=None):
     """按文件大小分割CSV文件"""
     try:
-        # 估算每行大小来计算chunksize
-        sample_df = pd.read_csv(input_file, nrows=1000, encoding=ENCODING)
-        if columns_to_drop:
-            sample_df = sample_df.drop(columns=columns_to_drop)
-        avg_row_size = len(sample_df.to_csv(index=False).encode(ENCODING)) / len(sample_df)
-        rows_per_chunk = int((size_per_file_mb * 1024 * 1024) / avg_row_size)
-        
         total_size = os.path.getsize(input_file) / (1024 * 1024)
         print(f"总大小: {total_size:.2f}MB, 每个文件大小: {size_per_file_mb}MB")
         
-        return split_by_rows(input_file, output_prefix, rows_per_chunk, columns_to_drop)
+        # 不需要删除列且不压缩时直接按字节区间复制，无需解析数据
+        if not columns_to_drop and cfg.compression is None:
+            total_files = split_by_byte_ranges(cfg, input_file, output_prefix, int(size_per_file_mb * 1024 * 1024))
+            print(f"\n分割完成！已生成 {total_files} 个文件")
+            return
+        
+        # 估算每行大小来计算chunksize
+        avg_row_size = estimate_row_size(input_file, columns_to_drop)
+        # 单行大于目标大小时每个文件至少包含一行
+        rows_per_chunk = max(1, int((size_per_file_mb * 1024 * 1024) / avg_row_size))
+        
+        return split_by_rows(cfg, input_file, output_prefix, rows_per_chunk, columns_to_drop)
         
     except Exception as e:
         print(f"分割文件时出错: {str(e)}")
         sys.exit(1)
 
-def process_csv_file(input_file, output_file, columns_to_drop, chunksize=10000):
-    """处理CSV文件，删除指定的列"""
+def process_csv_file(cfg: Config, input_file, output_file, columns_to_drop, output_format='csv'):
+    """处理CSV文件，删除指定的列
+
+    输入为Parquet文件时只读取保留的列；output_format为parquet时输出Parquet文件，
+    可将CSV一次性转换为Parquet，之后的删除列操作只需读取保留列的数据。
+    """
     try:
-        total_rows = sum(1 for _ in open(input_file, 'r', encoding='utf-8-sig')) - 1
-        pbar = tqdm(total=total_rows, desc="处理进度")
+        drop_set = set(columns_to_drop or [])
+        if is_parquet_file(input_file):
+            parquet_file = pq.ParquetFile(input_file)
+            keep_columns = [name for name in parquet_file.schema_arrow.names if name not in drop_set]
+            schema = pa.schema([parquet_file.schema_arrow.field(name) for name in keep_columns])
+            batches = parquet_file.iter_batches(batch_size=cfg.batch_size, columns=keep_columns)
+            # Parquet的行数直接从元数据中读取
+            pbar = tqdm(total=parquet_file.metadata.num_rows, desc="处理进度")
+            update = lambda batch: pbar.update(batch.num_rows)
+        else:
+            # 只打开一次输入文件，保留列的下标在读取标题后一次性确定
+            pbar = ByteProgress(input_file, "处理进度")
+            reader = open_arrow_reader(input_file, pbar.source)
+            keep_idx, schema = select_columns(reader.schema, columns_to_drop)
+            batches = (batch.select(keep_idx) for batch in reader)
+            update = lambda batch: pbar.update()
         
-        first_chunk = True
-        for chunk in pd.read_csv(input_file, chunksize=chunksize, encoding='utf-8-sig'):
-            chunk = chunk.drop(columns=columns_to_drop)
-            mode = 'w' if first_chunk else 'a'
-            header = first_chunk
-            chunk.to_csv(output_file, mode=mode, index=False, header=header, encoding='utf-8-sig')
-            pbar.update(len(chunk))
-            first_chunk = False
+        if output_format == 'parquet':
+            writer = pq.ParquetWriter(output_file, schema)
+        else:
+            writer = ArrowCsvWriter(output_file, schema, cfg)
+        try:
+            for batch in batches:
+                writer.write_batch(batch)
+                update(batch)
+        finally:
+            writer.close()
             
         pbar.close()
         print(f"\n处理完成！输出文件已保存为: {output_file}")
@@ -300,9 +991,16 @@ def main():
   # 按行数分割（每个文件1000行）
   %(prog)s input.csv --split-rows 1000 --output output_prefix
   
+  # 按文件大小分割（每个文件10MB）
+  %(prog)s input.csv --split-size 10 --output output_prefix
+  
   # 删除指定列（可以指定多个列名）
   %(prog)s input.csv --drop-columns "列名1,列名2" --output output.csv
   
+  # 转换为Parquet格式（之后对Parquet文件删除列只需读取保留的列）
+  %(prog)s input.csv --format parquet --output output.parquet
+  %(prog)s output.parquet --drop-columns "列名1,列名2" --format parquet --output output2.parquet
+  
   # 组合使用（截取前N条同时删除列）
   %(prog)s input.csv --top-n 1000 --drop-columns "列名1,列名2" --output output.csv
   
@@ -317,10 +1015,11 @@ def main():
   3. 按百分比分割文件
   4. 按日期列分割文件
   5. 按行数分割文件
-  6. 删除指定的列
-  7. 支持UTF-8编码，确保中文正常显示
-  8. 支持大文件处理，自动分块读取
-  9. 内存使用优化，支持性能调优''',
+  6. 按文件大小分割文件
+  7. 删除指定的列
+  8. 支持UTF-8编码，确保中文正常显示
+  9. 支持大文件处理，自动分块读取
+  10. 内存使用优化，支持性能调优''',
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog=example_text)
     
@@ -334,15 +1033,20 @@ def main():
     split_group.add_argument('--split-percent', type=float, help='按百分比分割，指定第一个文件的百分比（1-99）')
     split_group.add_argument('--split-date', help='按日期列分割，指定用于分割的日期列名')
     split_group.add_argument('--split-rows', type=int, help='按行数分割，指定每个文件的行数')
+    split_group.add_argument('--split-size', type=float, help='按文件大小分割，指定每个文件的大小（MB）')
     
     # 其他选项
     parser.add_argument('--date-format', help='日期格式，例如：%%Y-%%m-%%d，仅在使用 --split-date 时需要')
     parser.add_argument('--drop-columns', help='要删除的列名，多个列名用逗号分隔，例如：列名1,列名2')
+    parser.add_argument('--format', choices=['csv', 'parquet'], default='csv', help='删除列或格式转换时的输出格式（默认：csv）')
     
     # 性能调优选项
     parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help=f'批处理大小（默认：{BATCH_SIZE}）')
     parser.add_argument('--memory-threshold', type=int, default=MEMORY_THRESHOLD, help=f'内存使用率警告阈值（默认：{MEMORY_THRESHOLD}%）')
     parser.add_argument('--buffer-size', type=int, default=BUFFER_SIZE, help=f'文件缓冲区大小（默认：{BUFFER_SIZE//1024}KB）')
+    parser.add_argument('--compress', choices=['zstd'], help='压缩CSV输出文件（需要安装zstandard），输出文件名追加.zst')
+    parser.add_argument('--pure-python', action='store_true', help='不调用coreutils（split/head/tail），始终使用Python实现')
+    parser.add_argument('--workers', type=int, default=WORKERS, help=f'按日期分割时并行解析的进程数（默认：{WORKERS}）')
     
     args = parser.parse_args()
 
@@ -350,11 +1054,18 @@ def main():
         print(f"错误：找不到输入文件 {args.input_file}")
         sys.exit(1)
 
-    # 更新配置
-    global MEMORY_THRESHOLD, BUFFER_SIZE, BATCH_SIZE
-    MEMORY_THRESHOLD = args.memory_threshold
-    BUFFER_SIZE = args.buffer_size
-    BATCH_SIZE = args.batch_size
+    # 运行参数
+    cfg = Config(
+        batch_size=args.batch_size,
+        memory_threshold=args.memory_threshold,
+        buffer_size=args.buffer_size,
+        workers=args.workers,
+        use_coreutils=not args.pure_python,
+        compression=args.compress)
+
+    if cfg.compression == 'zstd' and zstandard is None:
+        print("错误：使用 --compress zstd 需要先安装 zstandard（pip install zstandard）")
+        sys.exit(1)
 
     # 如果只是显示列名
     if args.show_columns:
@@ -377,31 +1088,42 @@ def main():
             print(f"错误：以下列名不存在：{', '.join(invalid_columns)}")
             sys.exit(1)
 
+    # Parquet输入只支持删除列和格式转换
+    is_split = args.top_n or args.split_percent or args.split_date or args.split_rows or args.split_size
+    if is_parquet_file(args.input_file) and is_split:
+        print("错误：Parquet输入文件只支持 --drop-columns 和 --format 操作")
+        sys.exit(1)
+
     # 根据不同的操作类型执行相应的功能
     if args.top_n:
         if args.top_n <= 0:
             print("错误：--top-n 参数必须大于0")
             sys.exit(1)
-        split_top_n(args.input_file, args.output, args.top_n, columns_to_drop)
+        split_top_n(cfg, args.input_file, args.output, args.top_n, columns_to_drop)
     elif args.split_percent:
         if not 1 <= args.split_percent <= 99:
             print("错误：--split-percent 参数必须在1到99之间")
             sys.exit(1)
-        split_by_percentage(args.input_file, args.output, args.split_percent, columns_to_drop)
+        split_by_percentage(cfg, args.input_file, args.output, args.split_percent, columns_to_drop)
     elif args.split_date:
         if not args.date_format:
             print("错误：使用 --split-date 时必须指定 --date-format")
             sys.exit(1)
-        split_by_date(args.input_file, args.output, args.split_date, args.date_format, columns_to_drop)
+        split_by_date(cfg, args.input_file, args.output, args.split_date, args.date_format, columns_to_drop)
     elif args.split_rows:
         if args.split_rows <= 0:
             print("错误：--split-rows 参数必须大于0")
             sys.exit(1)
-        split_by_rows(args.input_file, args.output, args.split_rows, columns_to_drop)
-    elif columns_to_drop:
-        process_csv_file(args.input_file, args.output, columns_to_drop)
+        split_by_rows(cfg, args.input_file, args.output, args.split_rows, columns_to_drop)
+    elif args.split_size:
+        if args.split_size <= 0:
+            print("错误：--split-size 参数必须大于0")
+            sys.exit(1)
+        split_by_size(cfg, args.input_file, args.output, args.split_size, columns_to_drop)
+    elif columns_to_drop or args.format == 'parquet':
+        process_csv_file(cfg, args.input_file, args.output, columns_to_drop, args.format)
     else:
-        print("错误：必须指定一个操作类型（--top-n、--split-percent、--split-date、--split-rows 或 --drop-columns）")
+        print("错误：必须指定一个操作类型（--top-n、--split-percent、--split-date、--split-rows、--split-size、--drop-columns 或 --format parquet）")
         sys.exit(1)
 
 if __name__ == '__main__':
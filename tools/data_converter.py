@@ -7,12 +7,30 @@ import argparse
 import logging
 import codecs
 import re
+import mmap
+import itertools
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Any, Generator, TextIO, Set, Union, Optional
 import html
-import chardet
+# 编码检测：优先使用C实现的cchardet，其次charset-normalizer，最后chardet
+try:
+    import cchardet as chardet
+except ImportError:
+    try:
+        import charset_normalizer as chardet  # 提供与chardet兼容的detect接口
+    except ImportError:
+        import chardet
 from bs4 import BeautifulSoup
-import ijson  # 用于流式解析JSON
+# 用于流式解析JSON，优先使用C实现的后端
+try:
+    import ijson.backends.yajl2_c as ijson
+except ImportError:
+    try:
+        import ijson.backends.yajl2_cffi as ijson
+    except ImportError:
+        import ijson
 from tqdm import tqdm  # 用于显示进度条
 import os
 import gc
@@ -24,24 +42,95 @@ import psutil
 import random
 import pandas as pd  # 用于处理Excel和Parquet文件
 import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.json as pajson
 import pyarrow.parquet as pq
 import numpy as np
 
+# 可选依赖：更快的JSON解析
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
+
+# 可选依赖：基于C的HTML解析器
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:
+    HTMLParser = None
+
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+
+# 可选依赖：constant_memory模式写Excel
+try:
+    import xlsxwriter
+except ImportError:
+    xlsxwriter = None
+
 # 定义全局变量
 MEMORY_CHECK_INTERVAL = 100 * 1024 * 1024  # 每处理100MB检查一次内存
 MEMORY_THRESHOLD = 80  # 内存使用率警告阈值（百分数）
 BATCH_SIZE = 10000  # 默认批处理大小
 BUFFER_SIZE = 8192 * 1024  # 8MB文件缓冲区大小
 GC_INTERVAL = 50 * 1024 * 1024  # 每处理50MB执行一次GC
+MEMORY_CHECK_SECONDS = 0.5  # 内存检查的最小时间间隔（秒）
+JSON_ITEMS_PREFIX = 'item'  # ijson中顶层数组元素的路径前缀
+JSON_FULL_LOAD_SIZE = 100 * 1024 * 1024  # 小于100MB的JSON文件直接整体读取
+ORJSON_MAX_SIZE = 500 * 1024 * 1024  # orjson整体解析的文件大小上限
+SIMDJSON_MAX_SIZE = 4 * 1024 * 1024 * 1024 - 1  # simdjson单文档大小上限(4GB)
+ENCODING_SAMPLE_SIZE = 64 * 1024  # 编码检测默认采样大小
+ENCODING_SAMPLE_MAX = 256 * 1024  # 检测结果不确定时扩大的采样大小
+ENCODING_MIN_CONFIDENCE = 0.5  # 编码检测的最低置信度
+ENCODING_DETECT_BLOCK = 8192  # 增量编码检测每次输入的块大小
+SEPARATOR_SAMPLE_SIZE = 64 * 1024  # 分隔符检测的采样大小
+CSV_SEPARATORS = [',', '\t', ';', '|']  # 候选分隔符
+CSV_SNIFF_SIZE = 8192  # csv.Sniffer使用的采样大小
+ARROW_CSV_MIN_SIZE = 50 * 1024 * 1024  # 超过50MB的CSV使用PyArrow多线程解析
+CSV_STREAM_MIN_SIZE = 200 * 1024 * 1024  # 超过200MB的CSV转换时按批流式处理
+PARQUET_READ_BATCH_ROWS = 65536  # Parquet直接转CSV时每批读取的行数
+JSON_WRITE_BATCH_ROWS = 50000  # lines模式下每批序列化的行数
+JSON_LINES_MIN_CELLS = 5000000  # 单元格数超过该值时改用lines模式写入JSON
+EXCEL_WRITE_BATCH_ROWS = 50000  # openpyxl只写模式下每批转换的行数
+PARQUET_ROW_GROUP_ROWS = 262144  # Parquet每个行组的行数
+EXCEL_MAX_WORKERS = 2  # 目标格式为Excel时的最大并行进程数
+XLS_MAGIC = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'  # .xls(OLE2)文件头
+
+# 预编译的正则表达式
+_WS_RE = re.compile(r'\s+')  # 连续空白
+_NON_WS_BYTES_RE = re.compile(rb'\S')  # 非空白字节
+_DUP_PUNCT_RE = re.compile(r'[;,]{2,}|:{2,}')  # 重复的逗号/分号或冒号，一次扫描处理
+
+# clean_text的字符替换表：统一中文标点并移除零宽字符
+_CLEAN_TRANS = str.maketrans({
+    '\u201c': '"', '\u201d': '"',  # 统一引号
+    '，': ',',  # 统一逗号
+    '、': ';',  # 统一分隔符
+    '；': ';',  # 统一分号
+    '：': ':',  # 统一冒号
+    '．': '.',  # 统一点号
+    '\u200b': None, '\u200c': None, '\u200d': None,
+    '\u200e': None, '\u200f': None, '\ufeff': None,
+})
 
 # 支持的文件格式
 SUPPORTED_FORMATS = {
-    'json': ['.json'],
+    'json': ['.json', '.jsonl'],
     'csv': ['.csv', '.tsv'],
     'excel': ['.xlsx', '.xls'],
     'parquet': ['.parquet']
 }
 
+# 扩展名到格式的反查表
+_EXT_TO_FORMAT = {ext: fmt for fmt, exts in SUPPORTED_FORMATS.items() for ext in exts}
+
 def setup_logging():
     """设置日志配置"""
     logging.basicConfig(
@@ -52,18 +141,42 @@ def setup_logging():
 
 logger = setup_logging()
 
+@contextmanager
+def map_file(file_path: str, sequential: bool = False):
+    """
+    以只读方式内存映射文件，空文件返回空字节串
+    sequential为True时提示内核按顺序预读
+    """
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b''
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if sequential and hasattr(mm, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            yield mm
+
+def open_sequential(file_path: str, mode: str = 'rb', **kwargs):
+    """
+    以BUFFER_SIZE缓冲打开文件并提示内核按顺序预读，用于整文件顺序读取
+    """
+    f = open(file_path, mode, buffering=BUFFER_SIZE, **kwargs)
+    if hasattr(os, 'posix_fadvise'):
+        try:
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except OSError:
+            pass  # 预读提示失败不影响读取
+    return f
+
 def detect_format(file_path: str) -> str:
     """
     根据文件扩展名检测文件格式
     """
-    file_path = Path(file_path)
-    extension = file_path.suffix.lower()
-    
-    for format_name, extensions in SUPPORTED_FORMATS.items():
-        if extension in extensions:
-            return format_name
-    
-    raise ValueError(f"不支持的文件格式: {extension}。支持的格式: {', '.join([ext for exts in SUPPORTED_FORMATS.values() for ext in exts])}")
+    extension = os.path.splitext(file_path)[1].lower()
+    try:
+        return _EXT_TO_FORMAT[extension]
+    except KeyError:
+        raise ValueError(f"不支持的文件格式: {extension}。支持的格式: {', '.join(_EXT_TO_FORMAT)}") from None
 
 def detect_and_fix_encoding(content: str) -> str:
     """
@@ -90,114 +203,285 @@ def detect_and_fix_encoding(content: str) -> str:
         return content.decode('utf-8', errors='ignore')
     return content
 
-def try_different_encodings(file_path: str) -> tuple:
+def detect_encoding(file_path: str) -> str:
+    """
+    检测文件编码：先尝试UTF-8，失败时再用chardet检测
+    """
+    with map_file(file_path) as mm:
+        raw_data = mm[:ENCODING_SAMPLE_MAX]
+
+    sample = raw_data[:ENCODING_SAMPLE_SIZE]
+    if sample.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    try:
+        # 增量解码，避免采样末尾截断的多字节字符导致误判
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=len(sample) == len(raw_data))
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+
+    if hasattr(chardet, 'UniversalDetector'):
+        # 增量检测：按块输入，检测器有把握后立即停止
+        detector = chardet.UniversalDetector()
+        for start in range(0, len(raw_data), ENCODING_DETECT_BLOCK):
+            detector.feed(raw_data[start:start + ENCODING_DETECT_BLOCK])
+            if detector.done:
+                break
+        detector.close()
+        return detector.result['encoding'] or 'utf-8'
+
+    result = chardet.detect(sample)
+    if (result['confidence'] or 0) < ENCODING_MIN_CONFIDENCE and len(raw_data) > len(sample):
+        # 结果不确定时扩大采样范围
+        result = chardet.detect(raw_data)
+    return result['encoding'] or 'utf-8'
+
+def detect_separator(file_path: str, encoding: str = 'utf-8') -> str:
+    """
+    根据文件开头的采样检测CSV分隔符
+    """
+    # TSV文件固定使用制表符
+    if file_path.lower().endswith('.tsv'):
+        return '\t'
+    try:
+        with map_file(file_path) as mm:
+            sample = mm[:SEPARATOR_SAMPLE_SIZE].decode(encoding, errors='ignore')
+        # 优先用csv.Sniffer识别（能正确处理引号内的分隔符），只取完整的行
+        sniff_sample = sample[:CSV_SNIFF_SIZE]
+        if '\n' in sniff_sample:
+            sniff_sample = sniff_sample[:sniff_sample.rindex('\n')]
+        try:
+            return csv.Sniffer().sniff(sniff_sample, delimiters=''.join(CSV_SEPARATORS)).delimiter
+        except csv.Error:
+            pass
+        # 识别失败时按各候选分隔符的出现次数判断
+        counts = {sep: sample.count(sep) for sep in CSV_SEPARATORS}
+        return max(counts, key=counts.get)
+    except (OSError, LookupError):
+        # 默认使用逗号
+        return ','
+
+def try_different_encodings(file_path: str, encoding: Optional[str] = None) -> tuple:
     """
     尝试不同的编码方式读取文件
     """
-    encodings = ['utf-8', 'gbk', 'gb2312', 'gb18030', 'big5']
+    if encoding:
+        with open_sequential(file_path, 'r', encoding=encoding) as f:
+            return f.read(), encoding
+
+    # 先尝试检测出的编码，再依次尝试常见中文编码
+    detected = detect_encoding(file_path)
+    encodings = [detected] + [e for e in ['utf-8', 'gbk', 'gb2312', 'gb18030', 'big5'] if e != detected]
     
     for encoding in encodings:
         try:
-            with open(file_path, 'r', encoding=encoding) as f:
+            with open_sequential(file_path, 'r', encoding=encoding) as f:
                 content = f.read()
                 return content, encoding
-        except UnicodeDecodeError:
+        except (UnicodeDecodeError, LookupError):
             continue
     
-    # 如果所有编码都失败，尝试使用chardet检测
-    with open(file_path, 'rb') as f:
-        raw_data = f.read(1024 * 1024)  # 读取前1MB用于检测
-        result = chardet.detect(raw_data)
-        encoding = result['encoding']
-        
-        try:
-            with open(file_path, 'r', encoding=encoding) as f:
-                content = f.read()
-                return content, encoding
-        except:
-            raise UnicodeDecodeError(f"无法使用以下编码读取文件: {encodings + [encoding]}")
+    raise ValueError(f"无法使用以下编码读取文件: {encodings}")
+
+# 缓存当前进程对象和系统总内存，避免每次检查都重新获取
+_PROCESS = psutil.Process()
+# Linux下直接读取/proc/self/statm获取RSS，比psutil开销小
+_STATM_PATH = '/proc/self/statm'
+HAS_STATM = os.path.exists(_STATM_PATH) and hasattr(os, 'sysconf')
+if HAS_STATM:
+    _PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+    _TOTAL_MEMORY_MB = os.sysconf('SC_PHYS_PAGES') * _PAGE_SIZE / (1024 * 1024)
+else:
+    _TOTAL_MEMORY_MB = psutil.virtual_memory().total / (1024 * 1024)
+_last_memory_check = 0.0  # 上次检查内存的时间
+_last_memory = (0.0, 0.0)  # 上次检查的结果
+_last_gc_rss = 0.0  # 上次执行GC时的内存使用量(MB)
+
+def _reset_process():
+    """fork出的子进程需要重新获取自身的进程对象"""
+    global _PROCESS
+    _PROCESS = psutil.Process()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_process)
 
 def get_memory_usage():
     """获取当前进程的内存使用情况"""
-    process = psutil.Process(os.getpid())
-    memory_info = process.memory_info()
-    # 获取系统总内存
-    total_memory = psutil.virtual_memory().total / (1024 * 1024)  # MB
-    # 计算内存使用率
-    memory_percent = (memory_info.rss / (total_memory * 1024 * 1024)) * 100
-    return memory_info.rss / (1024 * 1024), memory_percent  # 返回使用量(MB)和使用率
+    if HAS_STATM:
+        with open(_STATM_PATH, 'rb') as f:
+            rss = int(f.read().split()[1]) * _PAGE_SIZE / (1024 * 1024)
+    else:
+        rss = _PROCESS.memory_info().rss / (1024 * 1024)
+    return rss, rss / _TOTAL_MEMORY_MB * 100  # 返回使用量(MB)和使用率
 
 def check_memory_usage():
-    """检查内存使用情况，如果超过阈值则发出警告"""
+    """
+    检查内存使用情况，如果超过阈值则发出警告；间隔不足MEMORY_CHECK_SECONDS时返回上次结果
+    仅在超过阈值且距上次GC内存又增长了GC_INTERVAL时才执行GC
+    """
+    global _last_memory_check, _last_memory, _last_gc_rss
+    now = time.monotonic()
+    if now - _last_memory_check < MEMORY_CHECK_SECONDS:
+        return _last_memory
+    _last_memory_check = now
     memory_usage, memory_percent = get_memory_usage()
     if memory_percent > MEMORY_THRESHOLD:
         logger.warning(f"内存使用超过阈值: {memory_usage:.2f}MB ({memory_percent:.1f}%)")
-    return memory_usage, memory_percent
+        if memory_usage - _last_gc_rss > GC_INTERVAL / (1024 * 1024):
+            gc.collect()
+            _last_gc_rss = memory_usage
+    _last_memory = (memory_usage, memory_percent)
+    return _last_memory
 
 def flatten_json(data: Dict[str, Any], parent_key: str = '', sep: str = '_') -> Dict[str, Any]:
-    """将嵌套的JSON结构展平为单层字典"""
-    items: List = []
+    """将嵌套的JSON结构展平为单层字典（单条记录使用，批量处理请用flatten_records）"""
+    result: Dict[str, Any] = {}
+    # 用显式栈代替递归，每层保存(键前缀, 剩余键值对迭代器)，保持原有的键顺序
+    stack = [(parent_key, iter(data.items()))]
+    while stack:
+        prefix, items = stack[-1]
+        for k, v in items:
+            new_key = f"{prefix}{sep}{k}" if prefix else k
+            
+            if isinstance(v, dict):
+                # 处理嵌套字典
+                stack.append((new_key, iter(v.items())))
+                break
+            elif isinstance(v, list):
+                if len(v) > 0:
+                    if isinstance(v[0], dict):
+                        # 字典列表依次展开，同名键以后出现的值为准
+                        stack.append((new_key, itertools.chain.from_iterable(item.items() for item in v)))
+                        break
+                    result[new_key] = ';'.join(str(x) for x in v)
+            else:
+                result[new_key] = v
+        else:
+            stack.pop()
+    return result
+
+def _expand_lists(data: Dict[str, Any]) -> Dict[str, Any]:
+    """将字典列表展开为带序号的子字典，标量列表用分号连接"""
+    result = {}
     for k, v in data.items():
-        new_key = f"{parent_key}{sep}{k}" if parent_key else k
-        
         if isinstance(v, dict):
-            # 处理嵌套字典
-            items.extend(flatten_json(v, new_key, sep=sep).items())
+            result[k] = _expand_lists(v)
         elif isinstance(v, list):
-            if len(v) > 0:
-                if isinstance(v[0], dict):
-                    # 如果是字典列表，展平每个字典
-                    flattened_list = []
-                    for item in v:
-                        flattened_list.append(flatten_json(item, new_key, sep=sep))
-                    # 合并所有展平后的字典
-                    merged_dict = {}
-                    for d in flattened_list:
-                        merged_dict.update(d)
-                    items.extend(merged_dict.items())
-                else:
-                    items.append((new_key, ';'.join(str(x) for x in v)))
+            if v and isinstance(v[0], dict):
+                result[k] = {str(i): _expand_lists(item) for i, item in enumerate(v)}
+            elif v:
+                result[k] = ';'.join(str(x) for x in v)
         else:
-            items.append((new_key, v))
-    return dict(items)
+            result[k] = v
+    return result
+
+def flatten_records(records: List[Dict[str, Any]], sep: str = '_') -> pd.DataFrame:
+    """
+    批量展平JSON记录并返回DataFrame
+    字典列表按序号展开（如 key_0_a、key_1_a），不会像flatten_json那样覆盖重复的键
+    """
+    # 先由json_normalize展平嵌套字典，再只处理包含列表的列
+    df = pd.json_normalize(records, sep=sep, max_level=None)
+    for col in df.columns[df.dtypes == object]:
+        is_list = df[col].map(lambda x: isinstance(x, list))
+        if not is_list.any():
+            continue
+        lists = df.loc[is_list, col]
+        if lists.map(lambda v: len(v) > 0 and isinstance(v[0], dict)).any():
+            # 存在字典列表时需要逐条记录按序号展开
+            return pd.json_normalize([_expand_lists(r) for r in records], sep=sep, max_level=None)
+        df[col] = df[col].where(~is_list, lists.map(lambda v: ';'.join(str(x) for x in v) if v else None))
+    return df
+
+def _dedup_punct(match) -> str:
+    """重复的冒号合并为一个冒号，重复的逗号/分号合并为一个分号"""
+    return ':' if match.group()[0] == ':' else ';'
 
 def clean_text(text: str) -> str:
     """清理文本内容"""
     if not text or not isinstance(text, str):
         return ''
     # 1. 替换换行符和多余空白
-    text = re.sub(r'\s+', ' ', text.strip())
-    # 2. 处理特殊字符
-    text = text.replace('"', '"').replace('"', '"')  # 统一引号
-    text = text.replace('，', ',')  # 统一逗号
-    text = text.replace('、', ';')  # 统一分隔符
-    text = text.replace('；', ';')  # 统一分号
-    text = text.replace('：', ':')  # 统一冒号
-    text = text.replace('．', '.')  # 统一点号
-    # 3. 移除零宽字符和其他不可见字符
-    text = re.sub(r'[\u200b\u200c\u200d\u200e\u200f\ufeff]', '', text)
-    # 4. 移除重复的标点符号
-    text = re.sub(r'[;,]{2,}', ';', text)
-    text = re.sub(r'[:]{2,}', ':', text)
-    return text
+    text = ' '.join(text.split())
+    # 2. 统一特殊字符并移除零宽字符
+    text = text.translate(_CLEAN_TRANS)
+    # 3. 移除重复的标点符号
+    return _DUP_PUNCT_RE.sub(_dedup_punct, text)
+
+def clean_text_series(series: pd.Series) -> pd.Series:
+    """对整列文本执行clean_text，非字符串值返回空字符串"""
+    if not (pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)):
+        return pd.Series('', index=series.index, dtype=object)
+    text = series.str.strip().str.replace(_WS_RE, ' ', regex=True).str.translate(_CLEAN_TRANS)
+    text = text.str.replace(_DUP_PUNCT_RE, _dedup_punct, regex=True)
+    return text.fillna('')
 
 def clean_html(content):
     """清理HTML标签和实体"""
+    if not isinstance(content, str):
+        return content
+    # 不含标签和实体的文本无需解析，只合并空白
+    if '<' not in content and '&' not in content:
+        return ' '.join(content.split())
     try:
-        # 使用BeautifulSoup解析HTML
-        soup = BeautifulSoup(content, 'html.parser')
-        # 获取纯文本内容
-        text = soup.get_text(separator=' ', strip=True)
+        # 获取纯文本内容：优先使用selectolax，其次lxml，最后BeautifulSoup
+        if HTMLParser is not None:
+            text = HTMLParser(content).text(separator=' ', strip=True)
+        elif lxml is not None:
+            text = ' '.join(lxml.html.fromstring(content).itertext()) if content.strip() else ''
+        else:
+            text = BeautifulSoup(content, 'html.parser').get_text(separator=' ', strip=True)
         # 解码HTML实体
         text = html.unescape(text)
         # 移除多余空白
-        text = re.sub(r'\s+', ' ', text).strip()
+        text = ' '.join(text.split())
         return text
     except Exception as e:
         logger.error(f"清理HTML时出错: {str(e)}")
         return content
 
 # 数据读取函数
+def _json_start(mm) -> int:
+    """返回JSON正文的起始位置（跳过UTF-8 BOM）"""
+    return len(codecs.BOM_UTF8) if mm[:3] == codecs.BOM_UTF8 else 0
+
+def is_json_lines(file_path: str) -> bool:
+    """
+    判断文件是否为JSON Lines格式：首行是完整的JSON对象且之后还有内容
+    """
+    with map_file(file_path) as mm:
+        start = _json_start(mm)
+        end = mm.find(b'\n', start)
+        if end == -1:
+            return False
+        first_line = mm[start:end].strip()
+        if not first_line.startswith(b'{'):
+            return False
+        try:
+            orjson.loads(first_line) if orjson is not None else json.loads(first_line)
+        except ValueError:
+            return False
+        return _NON_WS_BYTES_RE.search(mm, end) is not None
+
+def read_json_lines(file_path: str, batch_size: int = BATCH_SIZE) -> List[Any]:
+    """
+    逐行解析JSON Lines文件，返回记录列表
+    """
+    loads = orjson.loads if orjson is not None else json.loads
+    records = []
+    with map_file(file_path, sequential=True) as mm, \
+            tqdm(total=len(mm), unit='B', unit_scale=True, desc="读取JSON数据") as pbar:
+        mm.seek(_json_start(mm))
+        for line in iter(mm.readline, b''):
+            if not line.strip():
+                continue
+            records.append(loads(line))
+            if len(records) % batch_size == 0:
+                pbar.update(mm.tell() - pbar.n)
+                check_memory_usage()
+        pbar.update(mm.tell() - pbar.n)
+    return records
+
 def read_json(file_path: str, batch_size: int = BATCH_SIZE) -> pd.DataFrame:
     """
     读取JSON文件并返回DataFrame
@@ -206,38 +490,53 @@ def read_json(file_path: str, batch_size: int = BATCH_SIZE) -> pd.DataFrame:
     try:
         logger.info(f"正在读取JSON文件: {file_path}")
         
-        # 对于小文件，直接读取
         file_size = os.path.getsize(file_path)
-        if file_size < 100 * 1024 * 1024:  # 小于100MB的文件直接读取
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                if not isinstance(data, list):
-                    data = [data]
-                return pd.json_normalize(data)
-        
-        # 对于大文件，使用ijson流式解析
-        all_data = []
-        with open(file_path, 'rb') as f:
-            objects = ijson.items(f, 'item')
-            batch = []
-            
-            for obj in tqdm(objects, desc="读取JSON数据"):
-                batch.append(obj)
-                
-                if len(batch) >= batch_size:
-                    all_data.append(pd.json_normalize(batch))
-                    batch = []
-                    gc.collect()  # 回收内存
-            
-            # 处理剩余数据
-            if batch:
-                all_data.append(pd.json_normalize(batch))
+
+        # 先收集原始记录，最后只调用一次json_normalize，避免逐批合并DataFrame
+        records = []
         
-        # 合并所有批次的数据
-        if not all_data:
+        # JSON Lines文件逐行解析
+        if is_json_lines(file_path):
+            records = read_json_lines(file_path, batch_size)
+        # 优先使用simdjson：按需访问数组元素并转换为Python对象
+        elif simdjson is not None and file_size <= SIMDJSON_MAX_SIZE:
+            parser = simdjson.Parser()
+            with open_sequential(file_path) as f:
+                data = f.read()
+            doc = parser.parse(data[len(codecs.BOM_UTF8):] if data.startswith(codecs.BOM_UTF8) else data)
+            if not isinstance(doc, simdjson.Array):
+                records.append(doc.as_dict() if isinstance(doc, simdjson.Object) else doc)
+            else:
+                for obj in doc:
+                    records.append(obj.as_dict() if isinstance(obj, simdjson.Object) else obj)
+                    if len(records) % batch_size == 0:
+                        check_memory_usage()
+        # 中小文件整体读取，orjson可用时处理更大的文件
+        elif file_size < JSON_FULL_LOAD_SIZE or (orjson is not None and file_size < ORJSON_MAX_SIZE):
+            if orjson is not None:
+                # orjson不接受BOM，解析前跳过
+                with map_file(file_path, sequential=True) as mm, memoryview(mm) as mv:
+                    data = orjson.loads(mv[_json_start(mm):])
+            else:
+                with open_sequential(file_path) as f:
+                    data = json.load(f)
+            records = data if isinstance(data, list) else [data]
+        else:
+            # 对于大文件，使用ijson流式解析
+            # 进度条按已读取的字节数更新，而不是每个对象更新一次
+            with map_file(file_path, sequential=True) as mm, \
+                    tqdm.wrapattr(mm, 'read', total=file_size, desc="读取JSON数据") as f:
+                f.seek(_json_start(mm))
+                objects = ijson.items(f, JSON_ITEMS_PREFIX, use_float=True, buf_size=BUFFER_SIZE)
+                for obj in objects:
+                    records.append(obj)
+                    if len(records) % batch_size == 0:
+                        check_memory_usage()
+        
+        if not records:
             return pd.DataFrame()
         
-        result = pd.concat(all_data, ignore_index=True)
+        result = pd.json_normalize(records)
         logger.info(f"成功读取JSON文件: {file_path}, 共 {len(result)} 行数据")
         return result
     
@@ -253,29 +552,20 @@ def read_csv(file_path: str, **kwargs) -> pd.DataFrame:
     try:
         logger.info(f"正在读取CSV文件: {file_path}")
         
-        # 检测文件编码
-        with open(file_path, 'rb') as f:
-            raw_data = f.read(1024 * 1024)  # 读取前1MB用于检测
-            result = chardet.detect(raw_data)
-            encoding = result['encoding'] or 'utf-8'
+        # 检测文件编码，调用方已指定时跳过检测
+        encoding = kwargs.pop('encoding', None) or detect_encoding(file_path)
         
-        # 检测分隔符
-        try:
-            # 尝试读取前10行检测分隔符
-            with open(file_path, 'r', encoding=encoding, errors='ignore') as f:
-                sample = ''.join([f.readline() for _ in range(10)])
-            
-            # 检测常见分隔符
-            separators = [',', '\t', ';', '|']
-            counts = {sep: sample.count(sep) for sep in separators}
-            separator = max(counts, key=counts.get)
-            
-            # 如果是TSV文件但检测到的不是制表符，强制使用制表符
-            if file_path.lower().endswith('.tsv') and separator != '\t':
-                separator = '\t'
-        except:
-            # 默认使用逗号
-            separator = ','
+        # 检测分隔符，调用方已指定时跳过检测
+        separator = kwargs.pop('sep', None) or detect_separator(file_path, encoding)
+        
+        # 大文件使用PyArrow多线程解析，失败时回退到pandas
+        if not kwargs and os.path.getsize(file_path) > ARROW_CSV_MIN_SIZE:
+            try:
+                df = read_csv_arrow(file_path, encoding, separator)
+                logger.info(f"成功读取CSV文件: {file_path}, 共 {len(df)} 行数据")
+                return df
+            except (pa.ArrowException, UnicodeDecodeError, LookupError) as e:
+                logger.warning(f"PyArrow读取CSV失败，改用pandas读取: {str(e)}")
         
         # 读取CSV文件 - 使用新版pandas参数
         df = pd.read_csv(
@@ -283,6 +573,7 @@ def read_csv(file_path: str, **kwargs) -> pd.DataFrame:
             encoding=encoding,
             sep=separator,
             on_bad_lines='skip',  # 跳过错误行 (新版pandas参数)
+            memory_map=True,  # 内存映射读取，避免额外的缓冲区拷贝
             low_memory=False,  # 避免混合类型警告
             **kwargs
         )
@@ -294,6 +585,26 @@ def read_csv(file_path: str, **kwargs) -> pd.DataFrame:
         logger.error(f"读取CSV文件时出错: {str(e)}")
         raise
 
+def _arrow_csv_options(encoding: str, separator: str) -> tuple:
+    """
+    构造PyArrow CSV读取选项，跳过列数不符的行
+    """
+    # PyArrow自动去除UTF-8 BOM，无需Python层转码
+    if encoding.lower().replace('_', '-') in ('utf-8', 'utf-8-sig', 'utf8', 'ascii'):
+        encoding = 'utf8'
+    read_options = pacsv.ReadOptions(use_threads=True, encoding=encoding, block_size=BUFFER_SIZE)
+    parse_options = pacsv.ParseOptions(delimiter=separator, newlines_in_values=True,
+                                       invalid_row_handler=lambda row: 'skip')
+    return read_options, parse_options
+
+def read_csv_arrow(file_path: str, encoding: str, separator: str) -> pd.DataFrame:
+    """
+    使用PyArrow多线程读取CSV文件
+    """
+    read_options, parse_options = _arrow_csv_options(encoding, separator)
+    table = pacsv.read_csv(file_path, read_options=read_options, parse_options=parse_options)
+    return table.to_pandas()
+
 def read_excel(file_path: str, **kwargs) -> pd.DataFrame:
     """
     读取Excel文件并返回DataFrame
@@ -348,16 +659,21 @@ def read_parquet(file_path: str) -> pd.DataFrame:
         logger.info(f"正在读取Parquet文件: {file_path}")
         
         # 读取Parquet文件
-        df = pd.read_parquet(file_path)
+        table = pq.read_table(file_path)
+        df = table.to_pandas()
         
-        # 修复可能存在的编码问题
-        for col in df.select_dtypes(include=['object']).columns:
+        # 修复可能存在的编码问题：string列已是UTF-8，只需处理binary列
+        for i, field in enumerate(table.schema):
+            if not (pa.types.is_binary(field.type) or pa.types.is_large_binary(field.type)):
+                continue
             try:
-                # 尝试检测并修复编码问题
-                if df[col].dtype == 'object':
-                    df[col] = df[col].apply(lambda x: detect_and_fix_encoding(x) if isinstance(x, (str, bytes)) else x)
-            except:
-                pass
+                df[field.name] = table.column(i).cast(pa.string()).to_pandas()
+            except pa.ArrowInvalid:
+                # 非UTF-8数据，按列尝试中文编码
+                try:
+                    df[field.name] = df[field.name].str.decode('gb18030')
+                except UnicodeDecodeError:
+                    df[field.name] = df[field.name].str.decode('utf-8', errors='ignore')
         
         logger.info(f"成功读取Parquet文件: {file_path}, 共 {len(df)} 行数据")
         return df
@@ -367,6 +683,48 @@ def read_parquet(file_path: str) -> pd.DataFrame:
         raise
 
 # 数据写入函数
+# 已确认存在的输出目录，避免每次写入都重复创建
+_ENSURED_DIRS: Set[str] = set()
+
+def ensure_parent_dir(file_path: str):
+    """确保输出文件所在目录存在"""
+    parent = os.path.dirname(os.path.abspath(file_path))
+    if parent not in _ENSURED_DIRS:
+        os.makedirs(parent, exist_ok=True)
+        _ENSURED_DIRS.add(parent)
+
+def _json_default(obj):
+    """orjson无法直接序列化的类型：时间戳、时间差按pandas的date_format='iso'格式输出，缺失值转为null"""
+    if obj is pd.NaT or obj is pd.NA:
+        return None
+    if isinstance(obj, (pd.Timestamp, pd.Timedelta)):
+        # 与DataFrame.to_json一致（Series.to_json不给带时区的时间加'Z'）
+        return json.loads(pd.DataFrame([[obj]]).to_json(orient='values', date_format='iso'))[0][0]
+    return str(obj)
+
+def _iso_dates(df: pd.DataFrame) -> pd.DataFrame:
+    """把日期时间、时间差列转为pandas的date_format='iso'格式的字符串，使orjson与pandas写出的JSON一致"""
+    positions = [i for i, dtype in enumerate(df.dtypes)
+                 if pd.api.types.is_datetime64_any_dtype(dtype) or pd.api.types.is_timedelta64_dtype(dtype)]
+    if not positions:
+        return df
+    df = df.copy(deep=False)
+    for i in positions:
+        # 整列交给DataFrame.to_json格式化（向量化），NaT转为null
+        values = json.loads(df.iloc[:, [i]].to_json(orient='values', date_format='iso'))
+        df.isetitem(i, [row[0] for row in values])
+    return df
+
+def _write_json_lines(df: pd.DataFrame, f):
+    """分批转换为记录并逐行写入二进制文件，内存占用与批大小相关"""
+    if orjson is None:
+        f.write(df.to_json(orient='records', lines=True, force_ascii=False, date_format='iso').encode('utf-8'))
+        return
+    option = orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    for start in range(0, len(df), JSON_WRITE_BATCH_ROWS):
+        for record in _iso_dates(df.iloc[start:start + JSON_WRITE_BATCH_ROWS]).to_dict(orient='records'):
+            f.write(orjson.dumps(record, default=_json_default, option=option))
+
 def write_json(df: pd.DataFrame, file_path: str, orient: str = 'records', lines: bool = False):
     """
     将DataFrame写入JSON文件
@@ -381,14 +739,23 @@ def write_json(df: pd.DataFrame, file_path: str, orient: str = 'records', lines:
         logger.info(f"正在写入JSON文件: {file_path}")
         
         # 确保目录存在
-        os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+        ensure_parent_dir(file_path)
         
         # 对于大数据集，使用lines模式
-        if len(df) > 100000 or df.memory_usage(deep=True).sum() > 1024*1024*100:  # 超过10万行或100MB
+        if not lines and (len(df) > 100000 or len(df) * len(df.columns) > JSON_LINES_MIN_CELLS):  # 超过10万行或500万个单元格
             logger.info("检测到大数据集，使用lines模式写入JSON")
-            df.to_json(file_path, orient='records', lines=True, force_ascii=False)
+            lines = True
+        
+        if orjson is None:
+            df.to_json(file_path, orient='records' if lines else orient, lines=lines, force_ascii=False,
+                       date_format='iso')
+        elif lines:
+            with open(file_path, 'wb', buffering=BUFFER_SIZE) as f:
+                _write_json_lines(df, f)
         else:
-            df.to_json(file_path, orient=orient, force_ascii=False)
+            option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+            with open(file_path, 'wb', buffering=BUFFER_SIZE) as f:
+                f.write(orjson.dumps(_iso_dates(df).to_dict(orient=orient), default=_json_default, option=option))
         
         logger.info(f"成功写入JSON文件: {file_path}")
     
@@ -409,7 +776,7 @@ def write_csv(df: pd.DataFrame, file_path: str, **kwargs):
         logger.info(f"正在写入CSV文件: {file_path}")
         
         # 确保目录存在
-        os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+        ensure_parent_dir(file_path)
         
         # 决定分隔符
         sep = kwargs.pop('sep', ',')
@@ -445,28 +812,30 @@ def write_excel(df: pd.DataFrame, file_path: str, **kwargs):
         logger.info(f"正在写入Excel文件: {file_path}")
         
         # 确保目录存在
-        os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+        ensure_parent_dir(file_path)
         
         # 写入Excel文件
         sheet_name = kwargs.pop('sheet_name', 'Sheet1')
         
-        # 对于大数据集，进行批量写入
-        if len(df) > 100000:
-            logger.info("检测到大数据集，使用批量方式写入Excel")
-            with pd.ExcelWriter(file_path, engine='openpyxl') as writer:
-                # 每次写入5万行
-                chunk_size = 50000
-                for i in range(0, len(df), chunk_size):
-                    chunk_df = df.iloc[i:i+chunk_size]
-                    if i == 0:
-                        chunk_df.to_excel(writer, sheet_name=sheet_name, index=False, **kwargs)
-                    else:
-                        # 追加到已有的工作表
-                        chunk_df.to_excel(writer, sheet_name=sheet_name, startrow=i+1, header=False, index=False, **kwargs)
-                    
-                    # 释放内存
-                    del chunk_df
-                    gc.collect()
+        if xlsxwriter is not None:
+            # constant_memory模式逐行落盘，内存占用与行数无关
+            with pd.ExcelWriter(file_path, engine='xlsxwriter',
+                                engine_kwargs={'options': {'constant_memory': True}}) as writer:
+                df.to_excel(writer, sheet_name=sheet_name, index=False, **kwargs)
+        elif len(df) > 100000:
+            # 对于大数据集，使用openpyxl只写模式逐行追加
+            logger.info("检测到大数据集，使用只写模式写入Excel")
+            from openpyxl import Workbook
+            wb = Workbook(write_only=True)
+            ws = wb.create_sheet(sheet_name)
+            ws.append([str(col) for col in df.columns])
+            for i in range(0, len(df), EXCEL_WRITE_BATCH_ROWS):
+                chunk_df = df.iloc[i:i + EXCEL_WRITE_BATCH_ROWS]
+                # 缺失值写为空单元格
+                chunk_df = chunk_df.astype(object).where(chunk_df.notna(), None)
+                for row in chunk_df.itertuples(index=False, name=None):
+                    ws.append(row)
+            wb.save(file_path)
         else:
             df.to_excel(file_path, sheet_name=sheet_name, index=False, **kwargs)
         
@@ -489,15 +858,26 @@ def write_parquet(df: pd.DataFrame, file_path: str, **kwargs):
         logger.info(f"正在写入Parquet文件: {file_path}")
         
         # 确保目录存在
-        os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+        ensure_parent_dir(file_path)
         
-        # 转换所有对象列为字符串，确保兼容性
-        for col in df.select_dtypes(include=['object']).columns:
-            df[col] = df[col].astype(str)
+        # 由Arrow推断列类型，仅将混合类型的对象列转换为字符串
+        try:
+            schema = pa.Schema.from_pandas(df, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            df = df.copy(deep=False)
+            for col in df.select_dtypes(include=['object']).columns:
+                try:
+                    pa.array(df[col], from_pandas=True)
+                except (pa.ArrowInvalid, pa.ArrowTypeError):
+                    df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+            schema = pa.Schema.from_pandas(df, preserve_index=False)
         
-        # 写入Parquet文件
+        # 按行组分批转换并写入Parquet文件
         compression = kwargs.pop('compression', 'snappy')  # 默认使用snappy压缩
-        df.to_parquet(file_path, compression=compression, **kwargs)
+        with pq.ParquetWriter(file_path, schema, compression=compression, **kwargs) as writer:
+            for start in range(0, len(df), PARQUET_ROW_GROUP_ROWS):
+                chunk = df.iloc[start:start + PARQUET_ROW_GROUP_ROWS]
+                writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
         
         logger.info(f"成功写入Parquet文件: {file_path}")
     
@@ -505,13 +885,27 @@ def write_parquet(df: pd.DataFrame, file_path: str, **kwargs):
         logger.error(f"写入Parquet文件时出错: {str(e)}")
         raise
 
-def check_excel_file(file_path: str) -> bool:
+def check_excel_file(file_path: str, repair: bool = False) -> bool:
     """
-    检查Excel文件是否可读并尝试修复
+    检查Excel文件是否可读，repair为True时尝试通过复制文件修复
     返回True表示文件可读，False表示无法读取
     """
     logger.info(f"检查Excel文件: {file_path}")
     
+    # 快速检查：文件头符合Excel格式时直接返回，避免完整解析工作簿
+    import zipfile
+    try:
+        if zipfile.is_zipfile(file_path):
+            with zipfile.ZipFile(file_path) as zf:
+                if '[Content_Types].xml' in zf.namelist():
+                    return True
+        else:
+            with open(file_path, 'rb') as f:
+                if f.read(len(XLS_MAGIC)) == XLS_MAGIC:
+                    return True
+    except (OSError, zipfile.BadZipFile):
+        pass
+    
     try:
         # 尝试使用不同引擎读取文件头部数据
         engines = ['openpyxl', 'xlrd', 'odf']
@@ -531,10 +925,9 @@ def check_excel_file(file_path: str) -> bool:
             original_file = str(Path(file_path).parent / file_name[2:])
             if Path(original_file).exists():
                 logger.info(f"找到可能的原始文件: {original_file}")
-                return check_excel_file(original_file)
+                return check_excel_file(original_file, repair)
         
         # 2. 检查文件是否为压缩的ZIP格式（大多数.xlsx文件本质是ZIP）
-        import zipfile
         try:
             with zipfile.ZipFile(file_path) as zf:
                 # 检查是否包含Excel文件的标准结构
@@ -543,6 +936,10 @@ def check_excel_file(file_path: str) -> bool:
         except zipfile.BadZipFile:
             logger.warning(f"文件 {file_path} 不是有效的XLSX格式")
         
+        if not repair:
+            logger.error(f"无法读取Excel文件: {file_path}，可使用 --repair 尝试修复")
+            return False
+        
         # 3. 尝试复制到临时文件再读取
         import shutil
         import tempfile
@@ -578,7 +975,108 @@ def check_excel_file(file_path: str) -> bool:
         logger.error(f"检查Excel文件时发生错误: {str(e)}")
         return False
 
-def convert_file(input_file: str, output_file: str, batch_size: int = BATCH_SIZE):
+def _stream_csv(input_file: str, output_file: str, output_format: str,
+                read_options, parse_options, convert_options) -> int:
+    """按批读取CSV并逐批写出，返回写出的行数"""
+    rows = 0
+    with pa.OSFile(input_file) as source, \
+            tqdm(total=os.path.getsize(input_file), unit='B', unit_scale=True, desc="流式转换CSV") as pbar:
+        reader = pacsv.open_csv(source, read_options=read_options, parse_options=parse_options,
+                                convert_options=convert_options)
+        if output_format == 'csv':
+            sep = '\t' if output_file.lower().endswith('.tsv') else ','
+            with open(output_file, 'w', encoding='utf-8-sig', newline='', buffering=BUFFER_SIZE) as f:
+                # 先写表头，保证空文件也有列名
+                pd.DataFrame(columns=reader.schema.names).to_csv(f, sep=sep, index=False)
+                for batch in reader:
+                    batch.to_pandas().to_csv(f, sep=sep, index=False, header=False, quoting=csv.QUOTE_MINIMAL)
+                    rows += batch.num_rows
+                    pbar.update(source.tell() - pbar.n)
+        elif output_format == 'parquet':
+            # Arrow批次直接写入Parquet行组，不经过pandas
+            with pq.ParquetWriter(output_file, reader.schema, compression='snappy') as writer:
+                for batch in reader:
+                    writer.write_batch(batch)
+                    rows += batch.num_rows
+                    pbar.update(source.tell() - pbar.n)
+        else:
+            with open(output_file, 'wb', buffering=BUFFER_SIZE) as f:
+                for batch in reader:
+                    _write_json_lines(batch.to_pandas(), f)
+                    rows += batch.num_rows
+                    pbar.update(source.tell() - pbar.n)
+    return rows
+
+def convert_csv_streaming(input_file: str, output_file: str, output_format: str) -> int:
+    """
+    流式转换大CSV文件到CSV、JSON Lines或Parquet，不把整个文件载入内存
+    返回写出的行数
+    """
+    encoding = detect_encoding(input_file)
+    separator = detect_separator(input_file, encoding)
+    read_options, parse_options = _arrow_csv_options(encoding, separator)
+    ensure_parent_dir(output_file)
+    
+    # CSV输出按字符串读取所有列，保留原始文本（如前导零）
+    names = pacsv.open_csv(input_file, read_options=read_options, parse_options=parse_options).schema.names
+    as_strings = pacsv.ConvertOptions(column_types={name: pa.string() for name in names})
+    if output_format == 'csv':
+        return _stream_csv(input_file, output_file, output_format, read_options, parse_options, as_strings)
+    try:
+        return _stream_csv(input_file, output_file, output_format, read_options, parse_options, None)
+    except pa.ArrowInvalid as e:
+        # 按首个数据块推断的类型与后续数据不符时，改为按字符串重新转换
+        logger.warning(f"列类型推断失败，改为按字符串转换: {str(e)}")
+        return _stream_csv(input_file, output_file, output_format, read_options, parse_options, as_strings)
+
+def parquet_to_csv_direct(input_file: str, output_file: str, output_format: str = 'csv') -> Optional[int]:
+    """
+    使用PyArrow按批把Parquet直接写成CSV，不经过pandas
+    含嵌套或二进制列时返回None，交由pandas路径处理
+    """
+    pf = pq.ParquetFile(input_file)
+    schema = pf.schema_arrow
+    if any(pa.types.is_nested(t) or pa.types.is_binary(t) or pa.types.is_large_binary(t) for t in schema.types):
+        return None
+    # 与pandas路径一致，不输出pandas写入的索引列
+    index_columns = (schema.pandas_metadata or {}).get('index_columns', [])
+    columns = [name for name in schema.names if name not in index_columns]
+    
+    ensure_parent_dir(output_file)
+    sep = '\t' if output_file.lower().endswith('.tsv') else ','
+    write_options = pacsv.WriteOptions(delimiter=sep, quoting_style='needed')
+    rows = 0
+    with pa.OSFile(output_file, 'wb') as sink:
+        sink.write(codecs.BOM_UTF8)  # 与write_csv一致，带BOM兼容Excel
+        with pacsv.CSVWriter(sink, pa.schema([schema.field(name) for name in columns]),
+                             write_options=write_options) as writer:
+            for batch in pf.iter_batches(batch_size=PARQUET_READ_BATCH_ROWS, columns=columns):
+                writer.write_batch(batch)
+                rows += batch.num_rows
+    return rows
+
+def json_lines_to_parquet_direct(input_file: str, output_file: str, output_format: str = 'parquet') -> Optional[int]:
+    """
+    使用PyArrow直接把JSON Lines写成Parquet，嵌套对象按'.'展平（与json_normalize一致）
+    非JSON Lines文件返回None，交由pandas路径处理
+    """
+    if not is_json_lines(input_file):
+        return None
+    table = pajson.read_json(input_file, read_options=pajson.ReadOptions(block_size=BUFFER_SIZE))
+    while any(pa.types.is_struct(t) for t in table.schema.types):
+        table = table.flatten()
+    ensure_parent_dir(output_file)
+    pq.write_table(table, output_file, compression='snappy')
+    return table.num_rows
+
+# 可由PyArrow直接完成、无需经过pandas的格式组合
+DIRECT_CONVERTERS = {
+    ('csv', 'parquet'): convert_csv_streaming,
+    ('parquet', 'csv'): parquet_to_csv_direct,
+    ('json', 'parquet'): json_lines_to_parquet_direct,
+}
+
+def convert_file(input_file: str, output_file: str, batch_size: int = BATCH_SIZE, repair: bool = False):
     """
     根据文件扩展名自动转换文件格式
     
@@ -586,6 +1084,7 @@ def convert_file(input_file: str, output_file: str, batch_size: int = BATCH_SIZE
         input_file: 输入文件路径
         output_file: 输出文件路径
         batch_size: 批处理大小
+        repair: Excel文件无法读取时是否尝试修复
     """
     try:
         # 检测输入和输出格式
@@ -595,10 +1094,25 @@ def convert_file(input_file: str, output_file: str, batch_size: int = BATCH_SIZE
         logger.info(f"正在转换文件: {input_file} ({input_format}) -> {output_file} ({output_format})")
         
         # 对Excel文件进行额外检查
-        if input_format == 'excel' and not check_excel_file(input_file):
+        if input_format == 'excel' and not check_excel_file(input_file, repair):
             logger.warning(f"跳过无法读取的Excel文件: {input_file}")
             return
             
+        # PyArrow可直接完成的格式组合跳过pandas；大CSV转CSV/JSON时流式处理
+        # 失败或不适用时回退到整体读取
+        converter = DIRECT_CONVERTERS.get((input_format, output_format))
+        if (converter is None and input_format == 'csv' and output_format in ('csv', 'json')
+                and os.path.getsize(input_file) > CSV_STREAM_MIN_SIZE):
+            converter = convert_csv_streaming
+        if converter is not None:
+            try:
+                rows = converter(input_file, output_file, output_format)
+                if rows is not None:
+                    logger.info(f"文件转换完成: {input_file} -> {output_file}, 共 {rows} 行数据")
+                    return
+            except (pa.ArrowException, UnicodeDecodeError, LookupError) as e:
+                logger.warning(f"直接转换失败，改为整体读取: {str(e)}")
+        
         # 读取输入文件
         df = None
         if input_format == 'json':
@@ -616,7 +1130,7 @@ def convert_file(input_file: str, output_file: str, batch_size: int = BATCH_SIZE
         
         # 写入输出文件
         if output_format == 'json':
-            write_json(df, output_file)
+            write_json(df, output_file, lines=output_file.lower().endswith('.jsonl'))
         elif output_format == 'csv':
             write_csv(df, output_file)
         elif output_format == 'excel':
@@ -630,7 +1144,18 @@ def convert_file(input_file: str, output_file: str, batch_size: int = BATCH_SIZE
         logger.error(f"转换文件时出错: {str(e)}")
         raise
 
-def convert_directory(input_path: str, output_path: str, target_format: str, batch_size: int = BATCH_SIZE):
+def _init_worker(memory_threshold: int, buffer_size: int):
+    """进程池初始化：同步主进程中由命令行设置的全局配置（spawn启动的子进程只会重新导入默认值）"""
+    global MEMORY_THRESHOLD, BUFFER_SIZE
+    MEMORY_THRESHOLD = memory_threshold
+    BUFFER_SIZE = buffer_size
+
+def _convert_task(task: tuple):
+    """进程池任务：转换单个文件"""
+    convert_file(*task)
+
+def convert_directory(input_path: str, output_path: str, target_format: str, batch_size: int = BATCH_SIZE,
+                      workers: Optional[int] = None, repair: bool = False):
     """
     转换目录下的所有支持格式文件到目标格式
     
@@ -639,6 +1164,8 @@ def convert_directory(input_path: str, output_path: str, target_format: str, bat
         output_path: 输出目录路径
         target_format: 目标格式 (json/csv/excel/parquet)
         batch_size: 批处理大小
+        workers: 并行转换的进程数，默认为CPU核数
+        repair: Excel文件无法读取时是否尝试修复
     """
     try:
         input_path = Path(input_path)
@@ -654,7 +1181,7 @@ def convert_directory(input_path: str, output_path: str, target_format: str, bat
         if input_path.is_file():
             # 单个文件转换
             output_file = output_path / f"{input_path.stem}{SUPPORTED_FORMATS[target_format][0]}"
-            convert_file(str(input_path), str(output_file), batch_size)
+            convert_file(str(input_path), str(output_file), batch_size, repair)
         elif input_path.is_dir():
             # 处理目录下的所有文件
             all_files = []
@@ -664,10 +1191,23 @@ def convert_directory(input_path: str, output_path: str, target_format: str, bat
             
             logger.info(f"在目录 {input_path} 中找到 {len(all_files)} 个可转换文件")
             
-            for file_path in all_files:
-                # 构建输出文件路径
-                output_file = output_path / f"{file_path.stem}{SUPPORTED_FORMATS[target_format][0]}"
-                convert_file(str(file_path), str(output_file), batch_size)
+            # 构建输出文件路径
+            tasks = [(str(file_path), str(output_path / f"{file_path.stem}{SUPPORTED_FORMATS[target_format][0]}"), batch_size, repair)
+                     for file_path in all_files]
+            
+            # 各文件相互独立，使用多进程并行转换
+            workers = min(len(tasks), workers or os.cpu_count() or 1)
+            if target_format == 'excel':
+                # 写Excel时每个进程都需在内存中构建工作簿，限制并发数
+                workers = min(workers, EXCEL_MAX_WORKERS)
+            if workers <= 1:
+                for task in tasks:
+                    _convert_task(task)
+            else:
+                with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                         initargs=(MEMORY_THRESHOLD, BUFFER_SIZE)) as executor:
+                    for _ in tqdm(executor.map(_convert_task, tasks), total=len(tasks), desc="转换文件"):
+                        pass
         else:
             logger.error(f"输入路径 {input_path} 不存在")
             sys.exit(1)
@@ -788,7 +1328,7 @@ Examples:
   python data_converter.py --guide
   
 Supported formats:
-  - JSON (.json)
+  - JSON (.json, .jsonl)
   - CSV (.csv, .tsv)
   - Excel (.xlsx, .xls)
   - Parquet (.parquet)
@@ -803,6 +1343,10 @@ Supported formats:
     parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, 
                        help='Batch size for large files (default: ' + str(BATCH_SIZE) + ')')
     parser.add_argument('--guide', action='store_true', help='Show format conversion guide')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='Parallel processes for directory conversion (default: CPU count)')
+    parser.add_argument('--repair', action='store_true',
+                       help='Try to repair unreadable Excel files by copying them before reading')
     
     # 全局选项
     parser.add_argument('--memory-threshold', type=int, default=MEMORY_THRESHOLD, 
@@ -845,9 +1389,9 @@ Supported formats:
     
     # 转换文件或目录
     if input_path.is_file():
-        convert_file(str(input_path), str(output_path), args.batch_size)
+        convert_file(str(input_path), str(output_path), args.batch_size, args.repair)
     elif input_path.is_dir():
-        convert_directory(str(input_path), str(output_path), output_format, args.batch_size)
+        convert_directory(str(input_path), str(output_path), output_format, args.batch_size, args.workers, args.repair)
     else:
         logger.error(f"输入路径 {input_path} 不存在")
         sys.exit(1)
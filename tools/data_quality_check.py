@@ -11,16 +11,41 @@ from pathlib import Path
 import logging
 import numpy as np
 from typing import Dict, List, Optional, Union
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
 import pyarrow.parquet as pq
 import psutil
 import gc
 import os
+import itertools
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+# 用于流式解析JSON，优先使用C实现的后端
+try:
+    import ijson.backends.yajl2_c as ijson
+except ImportError:
+    try:
+        import ijson.backends.yajl2_cffi as ijson
+    except ImportError:
+        import ijson
+
+# 可选依赖：更快的JSON解析
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # 性能优化配置
 MEMORY_CHECK_INTERVAL = 100 * 1024 * 1024  # 每处理100MB检查一次内存
 MEMORY_THRESHOLD = 80  # 内存使用率警告阈值（百分数）
 BATCH_SIZE = 10000  # 默认批处理大小
 BUFFER_SIZE = 8192 * 1024  # 8MB文件缓冲区大小
+STREAM_MIN_SIZE = 500 * 1024 * 1024  # 摘要模式下超过500MB的CSV/Parquet/JSON文件按块流式统计
+JSON_PEEK_SIZE = 1024 * 1024  # 判断JSON结构时最多读取的首行字节数
+STREAM_SAMPLE_ROWS = 100000  # 流式统计时用于估算四分位数的抽样行数
+PREFETCH_MAX_BYTES = 512 * 1024 * 1024  # 预读后续文件时每个文件最多预读的字节数
+CATEGORY_MAX_RATIO = 0.5  # 唯一值占比低于此值的字符串列转为category
 
 # 配置日志
 logging.basicConfig(
@@ -29,6 +54,8 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+json_loads = orjson.loads if orjson is not None else json.loads
+
 def get_memory_usage():
     """获取当前进程的内存使用情况"""
     process = psutil.Process(os.getpid())
@@ -45,12 +72,150 @@ def check_memory_usage():
         gc.collect()
     return memory_usage, memory_percent
 
+def prefetch_file(file_path: Union[str, Path]):
+    """提示内核把文件预读到页缓存，立即返回，不支持的平台忽略"""
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    try:
+        fd = os.open(file_path, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, PREFETCH_MAX_BYTES, os.POSIX_FADV_WILLNEED)
+        finally:
+            os.close(fd)
+    except OSError:
+        pass
+
+def read_csv_arrow(file_path: Union[str, Path]) -> Optional[pd.DataFrame]:
+    """使用PyArrow多线程解析CSV，结果与pd.read_csv保持一致（日期时间列保留为字符串）
+    列名有重复或为空时返回None，由调用方改用pd.read_csv"""
+    read_options = pacsv.ReadOptions(block_size=BUFFER_SIZE, use_threads=True)
+    convert_options = pacsv.ConvertOptions(strings_can_be_null=True)
+    table = pacsv.read_csv(file_path, read_options=read_options, convert_options=convert_options)
+    # pandas会把重名列、空列名改写为'a.1'、'Unnamed: 2'，PyArrow保持原样，转为字典时会丢列
+    names = table.column_names
+    if len(set(names)) < len(names) or '' in names:
+        return None
+    # PyArrow会把日期时间推断为时间类型，而pd.read_csv保留原文，此时按字符串重新读取这些列
+    temporal = [field.name for field in table.schema if pa.types.is_temporal(field.type)]
+    if temporal:
+        convert_options.column_types = {name: pa.string() for name in temporal}
+        table = pacsv.read_csv(file_path, read_options=read_options, convert_options=convert_options)
+    return table.to_pandas()
+
+def detect_json_layout(file_path: Union[str, Path]) -> str:
+    """判断JSON文件结构：'lines'（每行一个对象）、'array'（顶层数组）或'other'"""
+    with open(file_path, 'rb') as f:
+        raw = f.read(JSON_PEEK_SIZE)
+    head = raw.lstrip(b'\xef\xbb\xbf').lstrip()
+    if head.startswith(b'['):
+        return 'array'
+    if head.startswith(b'{'):
+        # 首行是完整的对象且下一非空行也是对象（或扩展名为.jsonl）才是JSON Lines；
+        # df.to_json()输出的单行单个对象按普通JSON读取，格式化的单个对象首行只有'{'
+        first_line, _, rest = head.partition(b'\n')
+        rest = rest.lstrip()
+        second_line = rest.split(b'\n', 1)[0]
+        # 第二行被读取上限截断时无法完整解析，只看其是否以'{'开头
+        truncated = b'\n' not in rest and len(raw) == JSON_PEEK_SIZE
+        try:
+            if isinstance(json_loads(first_line), dict):
+                if Path(file_path).suffix.lower() == '.jsonl':
+                    return 'lines'
+                if truncated and second_line.startswith(b'{'):
+                    return 'lines'
+                if second_line and isinstance(json_loads(second_line), dict):
+                    return 'lines'
+        except ValueError:
+            pass
+    return 'other'
+
+def hash_rows(df: pd.DataFrame) -> np.ndarray:
+    """计算每行的64位哈希，把整行比较转为单列比较"""
+    return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+def _object_token(value) -> str:
+    """object列中单个非空值的哈希形式：字符串保持原样，数值与数值列的形式一致，其他值加上类型名
+    前缀用\x1f、\x1e而不用\x00，hash_pandas_object对字符串的哈希遇到\x00即截断"""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (bool, int, np.integer)):
+        return f"\x1f{int(value)}"
+    if isinstance(value, (float, np.floating)):
+        value = float(value)
+        if value.is_integer() and abs(value) < 2.0 ** 63:
+            return f"\x1f{int(value)}"
+        return f"\x1f{value}"
+    return f"\x1e{type(value).__name__}:{value}"
+
+def _numeric_tokens(col: pd.Series) -> pd.Series:
+    """数值列的哈希形式，带有与字符串区分的前缀：整数值写为整数（不经float64，保留超过2**53的精度），其余写为repr"""
+    if pd.api.types.is_integer_dtype(col):
+        return "\x1f" + col.astype(str)
+    floats = col.to_numpy(dtype='float64', na_value=np.nan)
+    tokens = col.astype(str).to_numpy(dtype=object)
+    integral = np.isfinite(floats) & (np.floor(floats) == floats) & (np.abs(floats) < 2.0 ** 63)
+    tokens[integral] = floats[integral].astype('int64').astype(str)
+    return "\x1f" + pd.Series(tokens, index=col.index, dtype=str)
+
+def hash_rows_stable(df: pd.DataFrame) -> np.ndarray:
+    """与推断类型无关的行哈希，供按块统计使用
+    各块分别推断类型（如含空值的整数块变为float64、含混合值的列变为object），各列先转为统一的字符串形式：
+    数值（含object列中的数值）按值写出并加前缀，与同样内容的字符串区分（duplicated()中1与'1'不同），空值保持为空"""
+    columns = {}
+    for i, (_, col) in enumerate(df.items()):
+        if pd.api.types.is_bool_dtype(col) or col.dtype == object:
+            tokens = col.astype(object).map(_object_token, na_action='ignore')
+        elif pd.api.types.is_integer_dtype(col) or pd.api.types.is_float_dtype(col):
+            tokens = _numeric_tokens(col)
+        elif pd.api.types.is_string_dtype(col):
+            tokens = col
+        else:
+            # 日期时间等其他类型按值的类型名和文本形式
+            tokens = col.astype(object).map(_object_token, na_action='ignore')
+        columns[i] = tokens.astype(str).mask(col.isna())
+    return hash_rows(pd.DataFrame(columns, index=df.index))
+
+def count_duplicate_hashes(row_hashes: np.ndarray) -> int:
+    """统计重复的行哈希数量（与DataFrame.duplicated().sum()一致，64位哈希碰撞可忽略）"""
+    return len(row_hashes) - len(pd.unique(row_hashes))
+
+def count_duplicate_rows(df: pd.DataFrame) -> int:
+    """统计全行重复的行数，与DataFrame.duplicated().sum()一致
+    hash_pandas_object按字符串形式哈希object值（1与'1'相同），且不区分None与NaN，
+    object列（或其category）中含非字符串值或空值时直接使用duplicated()"""
+    for _, col in df.items():
+        values = col.cat.categories if isinstance(col.dtype, pd.CategoricalDtype) else col
+        if values.dtype == object and pd.api.types.infer_dtype(values, skipna=False) != 'string':
+            return int(df.duplicated().sum())
+    return count_duplicate_hashes(hash_rows(df))
+
+def optimize_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """加载后压缩数据类型以减少后续每次扫描的数据量：整数列降为最小整数类型，低基数字符串列转为category
+    浮点列降为float32会损失精度，不做处理"""
+    if not df.columns.is_unique or len(df) == 0:
+        return df
+    
+    new_dtypes = {}
+    for col in df.select_dtypes(include=['integer']).columns:
+        dtype = pd.to_numeric(df[col], downcast='integer').dtype
+        if dtype != df[col].dtype:
+            new_dtypes[col] = dtype
+    for col in df.select_dtypes(include=['object']).columns:
+        try:
+            if df[col].nunique() / len(df) < CATEGORY_MAX_RATIO:
+                new_dtypes[col] = 'category'
+        except TypeError:
+            # 列表、字典等不可哈希的值无法转为category
+            continue
+    return df.astype(new_dtypes) if new_dtypes else df
+
 class DataQualityChecker:
     """数据质量检查类"""
     
     SUPPORTED_FORMATS = {
         '.csv': '逗号分隔值文件',
         '.json': 'JSON文件',
+        '.jsonl': 'JSON Lines文件',
         '.parquet': 'Parquet文件',
         '.xlsx': 'Excel文件',
         '.xls': 'Excel文件',
@@ -61,6 +226,12 @@ class DataQualityChecker:
         self.data = None
         self.file_path = None
         self.file_type = None
+        self.stream_source = None  # 流式统计时的文件路径，此时不加载self.data
+        self.source_dtypes = None  # 压缩前的原始数据类型，用于报告
+        self.source_memory = None  # 压缩前的内存占用（字节），用于报告，与流式统计口径一致
+        self.string_columns = None  # 压缩前的字符串列
+        self.numeric_columns = None  # 数值列，加载时计算一次供各项检查共用
+        self._nunique = None  # 各列唯一值数量缓存（空值计为一个值）
         self.error_stats = {"errors": [], "error_count": 0}
         
     def record_error(self, error_type: str, message: str):
@@ -77,8 +248,8 @@ class DataQualityChecker:
         """检查文件格式是否支持"""
         return file_path.suffix.lower() in self.SUPPORTED_FORMATS
         
-    def load_file(self, file_path: Union[str, Path]) -> bool:
-        """加载数据文件"""
+    def load_file(self, file_path: Union[str, Path], stream: bool = False) -> bool:
+        """加载数据文件，stream为True时大CSV/Parquet文件只记录路径，由get_summary_stats按块统计"""
         self.file_path = Path(file_path)
         self.file_type = self.file_path.suffix.lower()
         
@@ -91,9 +262,25 @@ class DataQualityChecker:
             logger.info(f"支持的格式: {', '.join(self.SUPPORTED_FORMATS.keys())}")
             return False
         
+        self.data = None
+        self.stream_source = None
+        self._nunique = None
+        if (stream and self.file_type in ('.csv', '.parquet', '.json', '.jsonl')
+                and self.file_path.stat().st_size > STREAM_MIN_SIZE
+                and (self.file_type not in ('.json', '.jsonl') or detect_json_layout(file_path) != 'other')):
+            self.stream_source = self.file_path
+            logger.info(f"文件较大，按块流式统计: {file_path}")
+            return True
+        
         try:
             if self.file_type == '.csv':
-                self.data = pd.read_csv(file_path, encoding='utf-8')
+                try:
+                    self.data = read_csv_arrow(file_path)
+                except pa.ArrowInvalid as e:
+                    # 列数不一致等PyArrow无法解析的情况回退到pandas
+                    logger.warning(f"PyArrow解析CSV失败，改用pandas: {str(e)}")
+                if self.data is None:
+                    self.data = pd.read_csv(file_path, encoding='utf-8')
             elif self.file_type == '.txt':
                 # 尝试不同的分隔符
                 for sep in [',', '\t', '|', ';']:
@@ -103,8 +290,9 @@ class DataQualityChecker:
                             break
                     except:
                         continue
-            elif self.file_type == '.json':
-                self.data = pd.read_json(file_path, encoding='utf-8')
+            elif self.file_type in ('.json', '.jsonl'):
+                lines = detect_json_layout(file_path) == 'lines'
+                self.data = pd.read_json(file_path, encoding='utf-8', lines=lines)
             elif self.file_type == '.parquet':
                 self.data = pq.read_table(file_path).to_pandas()
             elif self.file_type in ['.xlsx', '.xls']:
@@ -113,6 +301,13 @@ class DataQualityChecker:
             if self.data is None:
                 self.record_error("LoadError", f"无法解析文件内容: {file_path}")
                 return False
+            
+            # 报告中的数据类型按原始类型显示，再压缩类型
+            self.source_dtypes = self.data.dtypes
+            self.source_memory = self.data.memory_usage(deep=True).sum()
+            self.string_columns = self.data.select_dtypes(include=['object']).columns
+            self.data = optimize_dtypes(self.data)
+            self.numeric_columns = self.data.select_dtypes(include=[np.number]).columns
                 
             # 检查内存使用
             check_memory_usage()
@@ -133,77 +328,96 @@ class DataQualityChecker:
             "行数": len(self.data),
             "列数": len(self.data.columns),
             "列名": self.data.columns.tolist(),
-            "内存占用(MB)": round(self.data.memory_usage(deep=True).sum() / 1024 / 1024, 2)
+            "内存占用(MB)": round(self.source_memory / 1024 / 1024, 2)
         }
     
     def check_null_values(self) -> Dict:
         """检查空值"""
-        null_stats = {}
-        for col in self.data.columns:
-            null_count = self.data[col].isnull().sum()
-            null_stats[col] = {
-                "空值数量": int(null_count),
-                "空值比例": round(float(null_count / len(self.data) * 100), 2)
+        # 一次向量化统计所有列的空值
+        null_counts = self.data.isnull().sum().to_numpy()
+        null_ratios = (null_counts / len(self.data) * 100).round(2)
+        return {
+            col: {
+                "空值数量": int(count),
+                "空值比例": float(ratio)
             }
-        return null_stats
+            for col, count, ratio in zip(self.data.columns, null_counts, null_ratios)
+        }
+    
+    def _column_nunique(self) -> pd.Series:
+        """各列唯一值数量（空值计为一个值），同一次加载只计算一次，供重复值和类型检查共用"""
+        if self._nunique is None:
+            self._nunique = self.data.nunique(dropna=False)
+        return self._nunique
     
     def check_duplicates(self) -> Dict:
         """检查重复值"""
+        n = len(self.data)
         # 全行重复
-        full_duplicates = self.data.duplicated().sum()
-        # 单列重复
-        column_duplicates = {}
-        for col in self.data.columns:
-            dup_count = self.data[col].duplicated().sum()
-            column_duplicates[col] = {
-                "重复值数量": int(dup_count),
-                "重复值比例": round(float(dup_count / len(self.data) * 100), 2)
+        full_duplicates = count_duplicate_rows(self.data)
+        # 单列重复：重复值数量 = 行数 - 唯一值数量（空值计为一个值）
+        # 唯一值数量等于行数的列（如ID列）重复数直接为0
+        dup_counts = (n - self._column_nunique()).clip(lower=0).to_numpy()
+        dup_ratios = (dup_counts / n * 100).round(2)
+        column_duplicates = {
+            col: {
+                "重复值数量": int(count),
+                "重复值比例": float(ratio)
             }
+            for col, count, ratio in zip(self.data.columns, dup_counts, dup_ratios)
+        }
             
         return {
             "全行重复数": int(full_duplicates),
-            "全行重复比例": round(float(full_duplicates / len(self.data) * 100), 2),
+            "全行重复比例": round(float(full_duplicates / n * 100), 2),
             "单列重复统计": column_duplicates
         }
     
     def check_data_types(self) -> Dict:
         """检查数据类型"""
-        type_stats = {}
-        for col in self.data.columns:
-            type_stats[col] = {
-                "数据类型": str(self.data[col].dtype),
-                "非空唯一值数量": int(self.data[col].nunique()),
-                "示例值": str(self.data[col].iloc[0]) if len(self.data) > 0 else None
+        # 非空唯一值数量 = 含空值的唯一值数量 - 是否存在空值，复用重复值检查的结果
+        nunique = (self._column_nunique() - self.data.isnull().any()).to_numpy()
+        # 只取一次首行作为示例值
+        if len(self.data) > 0:
+            examples = [str(value) for value in next(self.data.itertuples(index=False, name=None))]
+        else:
+            examples = [None] * len(self.data.columns)
+        return {
+            col: {
+                "数据类型": str(dtype),
+                "非空唯一值数量": int(count),
+                "示例值": example
             }
-        return type_stats
+            for col, dtype, count, example in zip(self.data.columns, self.source_dtypes, nunique, examples)
+        }
     
     def check_numeric_stats(self) -> Dict:
         """检查数值统计"""
-        numeric_stats = {}
-        numeric_columns = self.data.select_dtypes(include=[np.number]).columns
+        numeric = self.data[self.numeric_columns]
+        if numeric.columns.empty:
+            return {}
         
-        for col in numeric_columns:
-            stats = self.data[col].describe()
-            numeric_stats[col] = {
-                "最小值": float(stats['min']),
-                "最大值": float(stats['max']),
-                "平均值": float(stats['mean']),
-                "中位数": float(stats['50%']),
-                "标准差": float(stats['std'])
-            }
-        return numeric_stats
+        # 一次agg按块计算所有数值列的统计量，避免逐列describe
+        stats = numeric.agg(['min', 'max', 'mean', 'median', 'std']).T
+        stats.columns = ["最小值", "最大值", "平均值", "中位数", "标准差"]
+        return {
+            col: {name: float(value) for name, value in row.items()}
+            for col, row in stats.astype(float).iterrows()
+        }
     
     def check_string_length(self) -> Dict:
         """检查字符串长度"""
         string_stats = {}
-        string_columns = self.data.select_dtypes(include=['object']).columns
-        
-        for col in string_columns:
-            lengths = self.data[col].astype(str).str.len()
+        if len(self.data) == 0:
+            return string_stats
+        for col in self.string_columns:
+            # 使用PyArrow的utf8_length向量化计算字符数
+            lengths = pc.utf8_length(pa.array(self.data[col].astype(str), type=pa.string()))
+            min_max = pc.min_max(lengths).as_py()
             string_stats[col] = {
-                "最短长度": int(lengths.min()),
-                "最长长度": int(lengths.max()),
-                "平均长度": round(float(lengths.mean()), 2)
+                "最短长度": int(min_max['min']),
+                "最长长度": int(min_max['max']),
+                "平均长度": round(pc.mean(lengths).as_py(), 2)
             }
         return string_stats
     
@@ -258,23 +472,21 @@ class DataQualityChecker:
                             break
                     except:
                         continue
-            elif self.file_type == '.json':
-                # JSON文件特殊处理：读取第一个非空记录
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        line = line.strip()
-                        if line and line not in ['[', ']', '{', '}']:
-                            try:
-                                data = json.loads(line)
-                                if isinstance(data, dict):
-                                    sample = pd.Series(data)
-                                elif isinstance(data, list):
-                                    sample = pd.Series(data[0] if data else {})
-                                break
-                            except:
-                                continue
+            elif self.file_type in ('.json', '.jsonl'):
+                # JSON文件特殊处理：流式解析出第一条记录即停止，不解析整个文件
+                layout = detect_json_layout(file_path)
+                with open(file_path, 'rb') as f:
+                    if f.read(3) != b'\xef\xbb\xbf':
+                        f.seek(0)
+                    if layout == 'array':
+                        first = next(ijson.items(f, 'item', use_float=True), None)
+                    else:
+                        first = next(ijson.items(f, '', multiple_values=True, use_float=True), None)
+                sample = pd.Series(first if isinstance(first, dict) else (first[0] if first else {}))
             elif self.file_type == '.parquet':
-                sample = pq.read_table(file_path, num_rows=2).to_pandas().iloc[1]
+                # 只读取第一个批次的前两行，不加载整个文件
+                batch = next(pq.ParquetFile(file_path).iter_batches(batch_size=2))
+                sample = batch.to_pandas().iloc[1]
             elif self.file_type in ['.xlsx', '.xls']:
                 sample = pd.read_excel(file_path, nrows=2).iloc[1]
                 
@@ -298,50 +510,121 @@ class DataQualityChecker:
         except Exception as e:
             return {"error": f"读取文件失败: {str(e)}"}
 
-    def get_summary_stats(self) -> Dict:
-        """获取数据质量摘要统计"""
-        if self.data is None:
-            return {"error": "未加载数据文件"}
+    @staticmethod
+    def _count_outliers(numeric: pd.DataFrame) -> pd.Series:
+        """按1.5倍IQR统计各数值列的异常值数量"""
+        # 一次quantile调用得到所有数值列的四分位数（每列只排序一次），再向量化统计异常值
+        q = numeric.quantile([0.25, 0.75])
+        q1, q3 = q.loc[0.25], q.loc[0.75]
+        iqr = q3 - q1
+        mask = numeric.lt(q1 - 1.5 * iqr, axis=1) | numeric.gt(q3 + 1.5 * iqr, axis=1)
+        return mask.sum(axis=0)
+    
+    @staticmethod
+    def _merge_dtype(old, new):
+        """合并不同数据块中同一列的类型"""
+        if old is None or old == new:
+            return new
+        if (pd.api.types.is_numeric_dtype(old) and pd.api.types.is_numeric_dtype(new)
+                and not pd.api.types.is_bool_dtype(old) and not pd.api.types.is_bool_dtype(new)):
+            return np.promote_types(old, new)
+        return np.dtype(object)
+    
+    def _iter_chunks(self):
+        """按块读取流式统计的文件"""
+        if self.file_type == '.parquet':
+            for batch in pq.ParquetFile(self.stream_source).iter_batches(batch_size=BATCH_SIZE):
+                yield batch.to_pandas()
+        elif self.file_type in ('.json', '.jsonl'):
+            if detect_json_layout(self.stream_source) == 'lines':
+                with pd.read_json(self.stream_source, lines=True, chunksize=BATCH_SIZE, encoding='utf-8') as reader:
+                    yield from reader
+            else:
+                # 顶层数组逐条解析，每BATCH_SIZE条组成一块
+                with open(self.stream_source, 'rb') as f:
+                    items = ijson.items(f, 'item', use_float=True)
+                    while True:
+                        records = list(itertools.islice(items, BATCH_SIZE))
+                        if not records:
+                            break
+                        yield pd.DataFrame(records)
+        else:
+            yield from pd.read_csv(self.stream_source, chunksize=BATCH_SIZE, encoding='utf-8')
+    
+    def _summary_stats_streaming(self) -> Dict:
+        """单遍按块累计摘要统计，内存占用与文件大小无关（行哈希除外，每行8字节）"""
+        total_rows = 0
+        memory_bytes = 0
+        null_counts = None
+        dtypes = {}
+        row_hashes = []
+        # 数值列抽样：每行赋随机键，保留键最小的STREAM_SAMPLE_ROWS行（等价于均匀抽样）
+        rng = np.random.default_rng()
+        sample = None
+        threshold = 1.0
+        
+        for chunk in self._iter_chunks():
+            total_rows += len(chunk)
+            memory_bytes += chunk.memory_usage(deep=True).sum()
             
-        # 基本信息
-        total_rows = len(self.data)
-        total_cols = len(self.data.columns)
+            nulls = chunk.isnull().sum()
+            null_counts = nulls if null_counts is None else null_counts.add(nulls, fill_value=0)
+            for col, dtype in chunk.dtypes.items():
+                # 全空的块不参与类型合并，避免字符串列因空块被判为float
+                if col not in dtypes or nulls[col] < len(chunk):
+                    dtypes[col] = self._merge_dtype(dtypes.get(col), dtype)
+            
+            # 行哈希用于统计全行重复，同一行在不同块中的类型可能不同，需用与类型无关的哈希
+            row_hashes.append(hash_rows_stable(chunk))
+            
+            keys = rng.random(len(chunk))
+            selected = keys < threshold
+            part = chunk.loc[selected].select_dtypes(include=[np.number])
+            part.index = keys[selected]
+            sample = part if sample is None else pd.concat([sample, part])
+            if len(sample) > STREAM_SAMPLE_ROWS:
+                sample = sample.sort_index().iloc[:STREAM_SAMPLE_ROWS]
+                threshold = sample.index[-1]
+            
+            check_memory_usage()
         
-        # 空值统计
-        null_counts = self.data.isnull().sum()
-        cols_with_nulls = sum(null_counts > 0)
-        total_nulls = null_counts.sum()
+        if not total_rows:
+            return {"error": "文件为空或无法读取数据"}
         
-        # 重复值统计
-        full_duplicates = self.data.duplicated().sum()
+        full_duplicates = count_duplicate_hashes(np.concatenate(row_hashes))
+        del row_hashes
         
-        # 数据类型统计
-        dtype_counts = self.data.dtypes.value_counts().to_dict()
-        dtype_counts = {str(k): int(v) for k, v in dtype_counts.items()}
+        dtype_counts = pd.Series([str(dtype) for dtype in dtypes.values()]).value_counts()
+        dtype_counts = {k: int(v) for k, v in dtype_counts.items()}
         
-        # 异常值检测（针对数值列）
-        numeric_cols = self.data.select_dtypes(include=[np.number]).columns
+        # 异常值按抽样中的比例估算
+        numeric_cols = [col for col, dtype in dtypes.items()
+                        if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)]
         outlier_stats = {}
-        if len(numeric_cols) > 0:
-            for col in numeric_cols:
-                q1 = self.data[col].quantile(0.25)
-                q3 = self.data[col].quantile(0.75)
-                iqr = q3 - q1
-                outliers = self.data[
-                    (self.data[col] < (q1 - 1.5 * iqr)) | 
-                    (self.data[col] > (q3 + 1.5 * iqr))
-                ]
-                if len(outliers) > 0:
-                    outlier_stats[col] = len(outliers)
+        if numeric_cols and sample is not None and len(sample) > 0:
+            sample = sample.reindex(columns=numeric_cols).astype(float)
+            counts = self._count_outliers(sample) / len(sample) * total_rows
+            outlier_stats = {col: int(round(count)) for col, count in counts.items() if round(count) > 0}
         
+        summary = self._build_summary(total_rows, len(dtypes), memory_bytes, null_counts,
+                                      full_duplicates, dtype_counts, outlier_stats)
+        summary["异常值统计"]["抽样估算"] = True
+        return summary
+    
+    @staticmethod
+    def _build_summary(total_rows: int, total_cols: int, memory_bytes: int, null_counts: pd.Series,
+                       full_duplicates: int, dtype_counts: Dict, outlier_stats: Dict) -> Dict:
+        """组装摘要统计结果"""
+        cols_with_nulls = int((null_counts > 0).sum())
+        total_nulls = null_counts.sum()
         return {
             "数据规模": {
                 "总行数": total_rows,
                 "总列数": total_cols,
-                "文件大小(MB)": round(self.data.memory_usage(deep=True).sum() / 1024 / 1024, 2)
+                "文件大小(MB)": round(memory_bytes / 1024 / 1024, 2)
             },
             "数据完整性": {
-                "含空值的列数": int(cols_with_nulls),
+                "含空值的列数": cols_with_nulls,
                 "空值总数": int(total_nulls),
                 "空值占比": round(float(total_nulls) / (total_rows * total_cols) * 100, 2)
             },
@@ -355,6 +638,42 @@ class DataQualityChecker:
                 "异常值详情": outlier_stats
             }
         }
+    
+    def get_summary_stats(self) -> Dict:
+        """获取数据质量摘要统计"""
+        if self.data is None:
+            if self.stream_source is not None:
+                # 流式统计时文件在这里才被解析，解析失败需在此记录，不能让异常传出进程池
+                try:
+                    return self._summary_stats_streaming()
+                except Exception as e:
+                    self.record_error("LoadError", f"加载文件失败: {str(e)}")
+                    return {"error": str(e)}
+            return {"error": "未加载数据文件"}
+            
+        # 基本信息
+        total_rows = len(self.data)
+        total_cols = len(self.data.columns)
+        
+        # 空值统计
+        null_counts = self.data.isnull().sum()
+        
+        # 重复值统计
+        full_duplicates = count_duplicate_rows(self.data)
+        
+        # 数据类型统计
+        dtype_counts = self.source_dtypes.value_counts().to_dict()
+        dtype_counts = {str(k): int(v) for k, v in dtype_counts.items()}
+        
+        # 异常值检测（针对数值列）
+        numeric = self.data[self.numeric_columns]
+        outlier_stats = {}
+        if len(numeric.columns) > 0:
+            counts = self._count_outliers(numeric)
+            outlier_stats = {col: int(count) for col, count in counts[counts > 0].items()}
+        
+        return self._build_summary(total_rows, total_cols, self.source_memory,
+                                   null_counts, full_duplicates, dtype_counts, outlier_stats)
 
 def show_help():
     """显示帮助信息"""
@@ -369,6 +688,7 @@ def show_help():
     - .xlsx : Excel文件
     - .xls  : Excel文件
     - .json : JSON文件
+    - .jsonl : JSON Lines文件
     - .parquet : Parquet文件
     - .txt  : 文本文件（自动识别分隔符）
 
@@ -378,11 +698,13 @@ def show_help():
     -d, --detail  显示详细的检查结果（不能与-s同时使用）
     -s, --sample  只显示随机样例记录，不进行数据分析
     -f, --format  使用格式化输出（更易读的文本格式）
+    -w, --workers 检查目录时的并行进程数（默认为CPU核数）
     -h, --help    显示此帮助信息
 
 输出格式：
     默认输出JSON格式，使用 -f 参数可以输出格式化的文本报告。
     如果输出文件扩展名为.txt，将自动使用格式化输出。
+    摘要模式下超过500MB的CSV/Parquet/JSON文件按块流式统计，异常值数量为抽样估算。
 
 使用示例：
     # 检查单个文件
@@ -508,6 +830,21 @@ def get_directory_summary(results: Dict) -> Dict:
     
     return summary
 
+def _check_one(task) -> Optional[Dict]:
+    """检查单个文件（供进程池调用，需定义在模块级以便pickle）"""
+    file_path, sample, detail, prefetch_path = task
+    if prefetch_path is not None:
+        # 检查当前文件时让内核预读下一批要检查的文件，I/O与计算重叠
+        prefetch_file(prefetch_path)
+    checker = DataQualityChecker()
+    if sample:
+        # 只读取一条记录
+        return checker.get_single_record(file_path)
+    # 正常的数据质量检查
+    if checker.load_file(file_path, stream=not detail):
+        return checker.run_all_checks() if detail else checker.get_summary_stats()
+    return None
+
 def process_path(path: Union[str, Path], checker: DataQualityChecker, args) -> Dict:
     """处理文件或目录"""
     path = Path(path)
@@ -519,21 +856,27 @@ def process_path(path: Union[str, Path], checker: DataQualityChecker, args) -> D
             results[str(path)] = checker.get_single_record(path)
         else:
             # 正常的数据质量检查
-            if checker.load_file(path):
+            if checker.load_file(path, stream=not args.detail):
                 result = checker.run_all_checks() if args.detail else checker.get_summary_stats()
                 results[str(path)] = result
     elif path.is_dir():
         # 递归处理目录下的所有支持格式的文件
-        for file_path in path.rglob("*"):
-            if file_path.is_file() and checker.is_supported_format(file_path):
-                if args.sample:
-                    # 只读取一条记录
-                    results[str(file_path)] = checker.get_single_record(file_path)
-                else:
-                    # 正常的数据质量检查
-                    if checker.load_file(file_path):
-                        result = checker.run_all_checks() if args.detail else checker.get_summary_stats()
-                        results[str(file_path)] = result
+        file_paths = [p for p in path.rglob("*") if p.is_file() and checker.is_supported_format(p)]
+        
+        # 各文件相互独立，使用多进程并行检查
+        workers = min(len(file_paths), args.workers or os.cpu_count() or 1)
+        # 同时在检查的文件有workers个，每个任务预读其后第workers个文件（样例模式只读少量数据，不预读）
+        tasks = [(file_path, args.sample, args.detail,
+                  None if args.sample or i + workers >= len(file_paths) else file_paths[i + workers])
+                 for i, file_path in enumerate(file_paths)]
+        if workers <= 1:
+            file_results = [_check_one(task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                file_results = list(executor.map(_check_one, tasks, chunksize=4))
+        for file_path, result in zip(file_paths, file_results):
+            if result is not None:
+                results[str(file_path)] = result
         
         # 如果不是样例模式，且有结果，添加目录统计
         if not args.sample and results:
@@ -543,8 +886,9 @@ def process_path(path: Union[str, Path], checker: DataQualityChecker, args) -> D
     
     return results
 
+@lru_cache(maxsize=4096, typed=True)
 def format_number(num: float) -> str:
-    """格式化数字输出"""
+    """格式化数字输出（按类型缓存，避免1和1.0共用结果）"""
     if isinstance(num, (int, np.integer)):
         return f"{num:,}"
     return f"{num:,.2f}"
@@ -668,6 +1012,7 @@ def main():
     parser.add_argument('--sample', '-s', action='store_true', help="只显示随机样例记录，不进行数据分析")
     parser.add_argument('--help', '-h', action='store_true', help="显示帮助信息")
     parser.add_argument('--format', '-f', action='store_true', help="是否使用格式化输出")
+    parser.add_argument('--workers', '-w', type=int, default=None, help="检查目录时的并行进程数，默认为CPU核数")
     
     args = parser.parse_args()
     
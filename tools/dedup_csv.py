@@ -5,10 +5,124 @@ import csv
 import os
 from collections import defaultdict
 
+import numpy as np
+
+try:
+    import numba  # 可选依赖，用于加速超集覆盖检查
+except ImportError:
+    numba = None
+
+# 读写文件时使用的缓冲区大小
+BUFFER_SIZE = 8 * 1024 * 1024
+
 def normalize_term_set(term_string):
     """将竖线分隔的字符串转换为集合，去除顺序因素"""
     return set(term.strip() for term in term_string.split('|') if term.strip())
 
+def encode_term_set(term_set, vocab):
+    """将词集映射为升序int32编号并编码为bytes，作为紧凑且可快速哈希的去重键"""
+    ids = sorted(vocab.setdefault(term, len(vocab)) for term in term_set)
+    return np.array(ids, dtype=np.int32).tobytes()
+
+def _find_kept_sets_python(term_sets):
+    """基于倒排索引的纯Python实现，未安装numba时使用"""
+    # 首先对集合按大小排序，从大到小
+    sorted_indices = sorted(range(len(term_sets)), key=lambda i: len(term_sets[i]), reverse=True)
+    
+    # 倒排索引：词 -> 包含该词的已保留集合编号
+    # 已保留的集合都不小于当前集合且互不相同，故包含当前集合全部词的已保留集合即为其超集
+    postings = defaultdict(set)
+    final_keep_indices = set()
+    for i in sorted_indices:
+        # 检查这个集合是否已经被其他集合覆盖：从最少见的词开始求交集
+        terms = sorted(term_sets[i].tolist(), key=lambda t: len(postings.get(t, ())))
+        if terms:
+            candidates = postings.get(terms[0], set())
+            for term in terms[1:]:
+                if not candidates:
+                    break
+                candidates = candidates & postings[term]
+            is_covered = bool(candidates)
+        else:
+            # 空集是任何集合的子集
+            is_covered = bool(final_keep_indices)
+        
+        if not is_covered:
+            final_keep_indices.add(i)
+            for term in terms:
+                postings[term].add(i)
+    return final_keep_indices
+
+if numba is not None:
+    @numba.njit(cache=True, boundscheck=False)
+    def _find_kept_csr(indices, indptr, order, post_indices, post_indptr):
+        """
+        集合以CSR存储（indices为各集合升序的词编号，indptr为偏移），按order（从大到小）检查覆盖
+        post_indices/post_indptr为词 -> 包含该词的集合编号的倒排索引，返回保留标记
+        """
+        keep = np.zeros(indptr.shape[0] - 1, dtype=np.bool_)
+        any_kept = False
+        for i in order:
+            start, end = indptr[i], indptr[i + 1]
+            covered = False
+            if start == end:
+                # 空集是任何集合的子集
+                covered = any_kept
+            else:
+                # 只需检查包含最少见词的集合
+                rarest = indices[start]
+                for k in range(start + 1, end):
+                    t = indices[k]
+                    if post_indptr[t + 1] - post_indptr[t] < post_indptr[rarest + 1] - post_indptr[rarest]:
+                        rarest = t
+                for p in range(post_indptr[rarest], post_indptr[rarest + 1]):
+                    j = post_indices[p]
+                    if not keep[j]:
+                        continue
+                    # 双指针判断集合i是否为已保留集合j的子集
+                    a, b, b_end = start, indptr[j], indptr[j + 1]
+                    while a < end and b < b_end:
+                        if indices[a] == indices[b]:
+                            a += 1
+                            b += 1
+                        elif indices[a] > indices[b]:
+                            b += 1
+                        else:
+                            break
+                    if a == end:
+                        covered = True
+                        break
+            if not covered:
+                keep[i] = True
+                any_kept = True
+        return keep
+
+def find_kept_sets(term_sets):
+    """
+    返回不被其他集合覆盖的集合编号（即极大集合）
+    term_sets中的集合互不相同，每个为升序int32数组
+    """
+    if numba is None:
+        return _find_kept_sets_python(term_sets)
+    if not term_sets:
+        return set()
+    
+    # 集合按CSR连续存储，交给numba编译的函数检查
+    sizes = np.array([len(term_set) for term_set in term_sets], dtype=np.int64)
+    indptr = np.zeros(len(term_sets) + 1, dtype=np.int64)
+    np.cumsum(sizes, out=indptr[1:])
+    indices = np.concatenate(term_sets).astype(np.int32, copy=False)
+    # 倒排索引：按词编号稳定排序集合编号
+    set_ids = np.repeat(np.arange(len(term_sets), dtype=np.int32), sizes)
+    by_term = np.argsort(indices, kind='stable')
+    post_indices = set_ids[by_term]
+    num_terms = int(indices.max()) + 1 if len(indices) else 0
+    post_indptr = np.zeros(num_terms + 1, dtype=np.int64)
+    np.cumsum(np.bincount(indices, minlength=num_terms), out=post_indptr[1:])
+    order = np.argsort(-sizes, kind='stable')
+    keep = _find_kept_csr(indices, indptr, order, post_indices, post_indptr)
+    return set(np.flatnonzero(keep).tolist())
+
 def process_csv(input_file='./inputData/tky/0426社会品名近似识别_原始模型输出+人工处理（进行中）.csv', 
                 output_file='./deduped_output.csv'):
     """
@@ -28,72 +142,56 @@ def process_csv(input_file='./inputData/tky/0426社会品名近似识别_原始
     if output_dir and not os.path.exists(output_dir):
         os.makedirs(output_dir)
     
-    # 首先读取所有记录，构建词集映射
-    term_sets = []  # 存储所有的词集
-    second_columns = []  # 存储第二列的值
+    # 第一步：单遍读取，读取时即去除完全相同的集合（只保留第一个）
+    # 只保存去重后的集合及其第二列的值，字典保持首次出现的顺序
+    # 词先映射为整数编号，集合以升序int32数组的bytes存储
+    vocab = {}
+    unique_sets = {}
+    total_rows = 0
     
     try:
         # 读取文件
-        with open(input_file, 'r', encoding='utf-8') as f:
+        with open(input_file, 'r', encoding='utf-8', newline='', buffering=BUFFER_SIZE) as f:
             csv_reader = csv.reader(f)
             next(csv_reader, None)  # 跳过标题行
             
             for row in csv_reader:
                 if len(row) >= 2:
-                    term_string = row[0]
-                    second_column = row[1] if len(row) > 1 else ""
-                    
-                    term_set = normalize_term_set(term_string)
-                    term_sets.append(term_set)
-                    second_columns.append(second_column)
+                    key = encode_term_set(normalize_term_set(row[0]), vocab)
+                    if key not in unique_sets:
+                        unique_sets[key] = row[1]
+                    total_rows += 1
     except Exception as e:
         print(f"读取文件时出错: {str(e)}")
         return
     
-    # 记录要保留的索引
-    keep_indices = set()
-    
-    # 第一步：处理完全相同的集合（只保留第一个）
-    unique_sets = {}  # 用于去除完全相同的集合
-    
-    for i, term_set in enumerate(term_sets):
-        # 将集合转换为可哈希的frozenset
-        frozen_set = frozenset(term_set)
-        
-        if frozen_set not in unique_sets:
-            unique_sets[frozen_set] = i
-            keep_indices.add(i)
+    term_sets = [np.frombuffer(key, dtype=np.int32) for key in unique_sets]
+    second_columns = list(unique_sets.values())
+    del unique_sets
     
     # 第二步：处理超集关系
-    # 首先对集合按大小排序，从大到小
-    sorted_indices = sorted(keep_indices, key=lambda i: len(term_sets[i]), reverse=True)
+    final_keep_indices = find_kept_sets(term_sets)
     
-    final_keep_indices = set()
-    for i in sorted_indices:
-        # 检查这个集合是否已经被其他集合覆盖
-        is_covered = False
-        for j in final_keep_indices:
-            if term_sets[i].issubset(term_sets[j]):
-                is_covered = True
-                break
-        
-        if not is_covered:
-            final_keep_indices.add(i)
+    # 编号 -> 词
+    id_to_term = [None] * len(vocab)
+    for term, term_id in vocab.items():
+        id_to_term[term_id] = term
     
     # 写入结果
     try:
-        with open(output_file, 'w', encoding='utf-8', newline='') as f:
+        with open(output_file, 'w', encoding='utf-8', newline='', buffering=BUFFER_SIZE) as f:
             csv_writer = csv.writer(f)
             
             # 写入标题行
             csv_writer.writerow(["去重后的名词集合", "保留的内容"])
             
-            # 写入保留的记录
-            for i in sorted(final_keep_indices):
-                original_terms = '|'.join(sorted(term_sets[i]))
-                csv_writer.writerow([original_terms, second_columns[i]])
+            # 写入保留的记录，一次writerows批量写出
+            csv_writer.writerows(
+                ('|'.join(sorted([id_to_term[t] for t in term_sets[i].tolist()])), second_columns[i])
+                for i in sorted(final_keep_indices)
+            )
         
-        print(f"去重完成! 原始记录数: {len(term_sets)}, 去重后记录数: {len(final_keep_indices)}")
+        print(f"去重完成! 原始记录数: {total_rows}, 去重后记录数: {len(final_keep_indices)}")
         print(f"去重结果已保存到: {output_file}")
     
     except Exception as e:
@@ -1,16 +1,34 @@
 import os
 import csv
-import glob
+import mmap
 import argparse
 from pathlib import Path
 import logging
-from contextlib import contextmanager
+from contextlib import contextmanager, ExitStack
 import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 
 # 设置日志
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# PyArrow读取CSV时每个解析块的大小
+BUFFER_SIZE = 8 * 1024 * 1024
+# 超过该大小的待检查文件按块流式读取、匹配和写出，内存占用只与块大小有关
+STREAM_MIN_SIZE = 1024 * 1024 * 1024
+# 流式处理时每块的大小；每块都要对参考ID重建一次哈希表，块不宜过小
+STREAM_BLOCK_SIZE = 256 * 1024 * 1024
+# Parquet输出使用的压缩算法
+PARQUET_COMPRESSION = 'zstd'
+# 输出文件的写缓冲区大小，减少write系统调用次数
+WRITE_BUFFER_SIZE = 4 * 1024 * 1024
+# 用csv.writer写出PyArrow数据时每次转换为Python对象的行数
+CSV_WRITE_ROWS = 100000
+
 # 增加CSV字段大小限制
 maxInt = sys.maxsize
 while True:
@@ -31,14 +49,223 @@ def safe_open_file(file_path, mode='r', encoding='utf-8'):
         if file:
             file.close()
 
-def process_csv_file(file_path, reference_ids, output_dir, check_key_column, output_type):
+def prepare_csv_arrow(file_path, key_column, block_size=BUFFER_SIZE):
+    """读取表头并构建PyArrow的CSV读取选项，所有列按字符串读取以保持原始内容
+    返回 (表头, 读取选项, 跳过的行数统计)；表头列数不足或含空行时返回None
+    """
+    file_name = os.path.basename(file_path)
+    with safe_open_file(file_path, 'r', 'utf-8') as f:
+        header = next(csv.reader(f), None)
+    if not header or len(header) <= key_column:
+        return None
+    # PyArrow会把空行读成各列为空的行，无法与空ID区分，含空行的文件交给逐行处理以保持跳过统计
+    with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if mm.find(b'\n\n') != -1 or mm.find(b'\n\r\n') != -1:
+            return None
+    
+    skipped_stats = {'empty_row': 0, 'insufficient_cols': 0, 'empty_id': 0, 'processing_error': 0}
+    
+    def handle_invalid_row(row):
+        # 与逐行处理一致：缺少匹配列的行计入跳过统计，其余列数不一致的行交给逐行处理
+        if row.actual_columns <= key_column:
+            logger.warning(f"文件 {file_name} 数据列数不足: {row.text[:100]}")
+            skipped_stats['insufficient_cols'] += 1
+            return 'skip'
+        return 'error'
+    
+    # 表头作为第一行数据读取（列名自动生成），避免重名列或BOM影响列类型的指定
+    read_options = pacsv.ReadOptions(autogenerate_column_names=True, block_size=block_size)
+    parse_options = pacsv.ParseOptions(newlines_in_values=True, invalid_row_handler=handle_invalid_row)
+    convert_options = pacsv.ConvertOptions(
+        column_types={f"f{i}": pa.string() for i in range(len(header))},
+        strings_can_be_null=False, quoted_strings_can_be_null=False
+    )
+    options = {'read_options': read_options, 'parse_options': parse_options, 'convert_options': convert_options}
+    return header, options, skipped_stats
+
+def read_csv_arrow(file_path, key_column):
+    """使用PyArrow多线程解析CSV
+    返回 (表头, 数据表, 跳过的行数统计)；表头列数不足或含空行时返回None
+    列数与表头不一致且无法跳过的行、非UTF-8内容会抛出pa.ArrowInvalid，由调用方回退到逐行处理
+    """
+    prepared = prepare_csv_arrow(file_path, key_column)
+    if prepared is None:
+        return None
+    header, options, skipped_stats = prepared
+    # 通过内存映射解析，直接读取页缓存，不再经过额外的读缓冲区
+    with pa.memory_map(file_path) as source:
+        table = pacsv.read_csv(source, **options)
+    return header, table.slice(1), skipped_stats
+
+def open_csv_output(file_path):
+    """打开CSV输出文件（与逐行处理的打开方式一致）"""
+    return open(file_path, 'w', encoding='utf-8', newline='', buffering=WRITE_BUFFER_SIZE)
+
+def write_rows_csv(writer, table):
+    """用csv.writer分批写出PyArrow表的行
+    PyArrow的CSV写出会给所有字符串加引号，用csv.writer按需加引号，与逐行处理的输出逐字节一致"""
+    for batch in table.to_batches(max_chunksize=CSV_WRITE_ROWS):
+        writer.writerows(zip(*(column.to_pylist() for column in batch.columns)))
+
+def write_csv_arrow(file_path, header, table):
+    """写出表头和PyArrow表中的数据行"""
+    with open_csv_output(file_path) as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        write_rows_csv(writer, table)
+
+def parquet_column_names(header, num_columns):
+    """生成Parquet列名（与pandas读取CSV一致）：空列名或超出表头的列记为"Unnamed: i"，重名列追加".n"后缀"""
+    names = []
+    used = set()
+    for i in range(num_columns):
+        # 表头按原样读取，第一列可能带有BOM
+        name = header[i].lstrip('\ufeff') if i == 0 and header else (header[i] if i < len(header) else '')
+        base = name or f"Unnamed: {i}"
+        name, n = base, 0
+        while name in used:
+            n += 1
+            name = f"{base}.{n}"
+        used.add(name)
+        names.append(name)
+    return names
+
+def write_parquet(file_path, header, table):
+    """以表头作为列名写出Parquet文件"""
+    table = table.rename_columns(parquet_column_names(header, table.num_columns))
+    pq.write_table(table, file_path, compression=PARQUET_COMPRESSION)
+
+def rows_to_table(header, rows):
+    """把逐行处理得到的行转换为字符串列的PyArrow表，列数不足的行以空值补齐"""
+    num_columns = max(len(header), max(len(row) for row in rows))
+    columns = [pa.array([row[i] if i < len(row) else None for row in rows], type=pa.string())
+               for i in range(num_columns)]
+    return pa.table(columns, names=parquet_column_names(header, num_columns))
+
+def collect_ids_arrow(file_path, key_column):
+    """使用PyArrow读取参考文件指定列的非空ID（已去除首尾空白，可能有重复），返回None表示需要逐行读取"""
+    result = read_csv_arrow(file_path, key_column)
+    if result is None:
+        return None
+    _, table, _ = result
+    ids = pc.utf8_trim_whitespace(table.column(key_column))
+    return pc.filter(ids, pc.not_equal(ids, ''))
+
+def process_csv_file_arrow_streaming(file_path, reference_value_set, output_files, check_key_column,
+                                     output_format='csv'):
+    """大文件按块读取、匹配并追加写出，相当于按块执行半连接/反连接，返回None表示需要逐行处理"""
+    prepared = prepare_csv_arrow(file_path, check_key_column, STREAM_BLOCK_SIZE)
+    if prepared is None:
+        return None
+    header, options, skipped_stats = prepared
+    
+    counts = {'unmatched': 0, 'matched': 0}
+    with ExitStack() as stack:
+        reader = pacsv.open_csv(stack.enter_context(pa.memory_map(file_path)), **options)
+        writers = {}
+        is_first_batch = True
+        for batch in reader:
+            if is_first_batch:
+                # 第一行是表头
+                batch = batch.slice(1)
+                is_first_batch = False
+            if not batch.num_rows:
+                continue
+            
+            row_ids = pc.utf8_trim_whitespace(batch.column(check_key_column))
+            has_id = pc.not_equal(row_ids, '')
+            skipped_stats['empty_id'] += batch.num_rows - pc.sum(has_id).as_py()
+            is_matched = pc.is_in(row_ids, value_set=reference_value_set)
+            
+            for output_type, output_path in output_files.items():
+                mask = pc.and_(has_id, is_matched if output_type == 'matched' else pc.invert(is_matched))
+                rows = batch.filter(mask)
+                if not rows.num_rows:
+                    continue
+                # 输出文件在第一次有数据时才创建
+                writer = writers.get(output_type)
+                if writer is None:
+                    if output_format == 'parquet':
+                        schema = pa.schema([pa.field(name, pa.string())
+                                            for name in parquet_column_names(header, batch.num_columns)])
+                        writer = stack.enter_context(pq.ParquetWriter(output_path, schema,
+                                                                      compression=PARQUET_COMPRESSION))
+                    else:
+                        writer = csv.writer(stack.enter_context(open_csv_output(output_path)))
+                        writer.writerow(header)
+                    writers[output_type] = writer
+                if output_format == 'parquet':
+                    writer.write_batch(pa.RecordBatch.from_arrays(rows.columns, schema=writer.schema))
+                else:
+                    write_rows_csv(writer, pa.Table.from_batches([rows]))
+                counts[output_type] += rows.num_rows
+    
+    return counts['unmatched'], counts['matched'], skipped_stats
+
+def process_csv_file_arrow(file_path, reference_value_set, output_files, check_key_column, output_format='csv'):
+    """使用PyArrow整列匹配ID并按掩码筛选输出，返回None表示需要逐行处理"""
+    if os.path.getsize(file_path) >= STREAM_MIN_SIZE:
+        return process_csv_file_arrow_streaming(file_path, reference_value_set, output_files, check_key_column,
+                                                output_format)
+    result = read_csv_arrow(file_path, check_key_column)
+    if result is None:
+        return None
+    header, table, skipped_stats = result
+    
+    row_ids = pc.utf8_trim_whitespace(table.column(check_key_column))
+    has_id = pc.not_equal(row_ids, '')
+    skipped_stats['empty_id'] = table.num_rows - pc.sum(has_id).as_py() if table.num_rows else 0
+    # 一次is_in调用完成整列的哈希查找
+    is_matched = pc.is_in(row_ids, value_set=reference_value_set)
+    
+    counts = {'unmatched': 0, 'matched': 0}
+    for output_type, output_path in output_files.items():
+        mask = pc.and_(has_id, is_matched if output_type == 'matched' else pc.invert(is_matched))
+        rows = table.filter(mask)
+        counts[output_type] = rows.num_rows
+        # 没有数据时不创建输出文件
+        if rows.num_rows:
+            if output_format == 'parquet':
+                write_parquet(output_path, header, rows)
+            else:
+                write_csv_arrow(output_path, header, rows)
+    
+    return counts['unmatched'], counts['matched'], skipped_stats
+
+# 逐行处理时使用的参考ID集合缓存：(PyArrow数组, 对应的Python集合)
+_reference_id_set_cache = (None, None)
+
+def get_reference_id_set(reference_value_set):
+    """把参考ID数组转换为Python集合，只在首次需要逐行处理时构建，之后复用"""
+    global _reference_id_set_cache
+    cached_array, cached_set = _reference_id_set_cache
+    if cached_array is not reference_value_set:
+        cached_set = frozenset(reference_value_set.to_pylist())
+        _reference_id_set_cache = (reference_value_set, cached_set)
+    return cached_set
+
+def remove_stale_outputs(output_files, unmatched_count, matched_count):
+    """删除没有数据的输出对应的已有文件（之前运行的结果或回退前写出的部分结果）"""
+    counts = {'unmatched': unmatched_count, 'matched': matched_count}
+    for output_type, output_path in output_files.items():
+        if counts[output_type] == 0 and os.path.exists(output_path):
+            os.remove(output_path)
+            logger.info(f"删除空文件 {output_path}")
+
+def process_csv_file(file_path, reference_ids, output_dir, check_key_column, output_type,
+                     reference_value_set=None, output_format='csv'):
     """处理单个CSV文件
     output_type: 'unmatched' - 只输出未匹配的数据
                 'matched' - 只输出匹配的数据
                 'both' - 同时输出匹配和未匹配的数据
+    output_format: 'csv' 或 'parquet'（zstd压缩，扩展名为.parquet）
+    reference_value_set: 参考ID的PyArrow数组，处理多个文件时由调用方构建一次后复用
+    reference_ids为None时，仅在需要逐行处理时由reference_value_set构建Python集合
     """
     file_name = os.path.basename(file_path)
     file_name_without_ext, file_ext = os.path.splitext(file_name)
+    if output_format == 'parquet':
+        file_ext = '.parquet'
     
     # 根据输出类型设置输出文件路径
     output_files = {}
@@ -57,22 +284,40 @@ def process_csv_file(file_path, reference_ids, output_dir, check_key_column, out
     }
     
     try:
-        # 打开输入文件和输出文件
-        with safe_open_file(file_path, 'r', 'utf-8') as f_in:
-            csv_reader = csv.reader(f_in)
+        # 优先使用PyArrow整列处理，无法解析时回退到逐行处理
+        try:
+            if reference_value_set is None:
+                reference_value_set = pa.array(list(reference_ids), type=pa.string())
+            result = process_csv_file_arrow(file_path, reference_value_set, output_files, check_key_column,
+                                            output_format)
+            if result is not None:
+                remove_stale_outputs(output_files, result[0], result[1])
+                return result
+        except pa.ArrowInvalid as e:
+            logger.warning(f"文件 {file_name} 无法整列解析，改为逐行处理: {e}")
+        
+        if reference_ids is None:
+            reference_ids = get_reference_id_set(reference_value_set)
+        
+        with ExitStack() as stack:
+            csv_reader = csv.reader(stack.enter_context(safe_open_file(file_path, 'r', 'utf-8')))
+            header = next(csv_reader, None)
             
-            # 打开所有需要的输出文件
-            output_handles = {}
-            csv_writers = {}
-            for output_type, file_path in output_files.items():
-                output_handles[output_type] = open(file_path, 'w', encoding='utf-8', newline='')
-                csv_writers[output_type] = csv.writer(output_handles[output_type])
+            # 输出文件在第一次写入数据行时才打开并写入表头，没有数据的输出不创建文件
+            # Parquet在处理结束后整体写出，先把行收集到列表
+            write_row = {}
+            parquet_rows = {}
+            if output_format == 'parquet':
+                for output_type in output_files:
+                    parquet_rows[output_type] = []
+                    write_row[output_type] = parquet_rows[output_type].append
             
-            # 读取并写入表头
-            header = next(csv_reader, None)
-            if header:
-                for writer in csv_writers.values():
+            def open_output(output_type):
+                writer = csv.writer(stack.enter_context(open_csv_output(output_files[output_type])))
+                if header:
                     writer.writerow(header)
+                write_row[output_type] = writer.writerow
+                return writer.writerow
             
             # 处理每一行
             for row_num, row in enumerate(csv_reader, start=2):
@@ -93,39 +338,52 @@ def process_csv_file(file_path, reference_ids, output_dir, check_key_column, out
                     
                     # 根据ID匹配情况写入相应的输出文件
                     if row_id not in reference_ids:
-                        if 'unmatched' in csv_writers:
-                            csv_writers['unmatched'].writerow(row)
+                        if 'unmatched' in output_files:
+                            (write_row.get('unmatched') or open_output('unmatched'))(row)
                             unmatched_count += 1
                     else:
-                        if 'matched' in csv_writers:
-                            csv_writers['matched'].writerow(row)
+                        if 'matched' in output_files:
+                            (write_row.get('matched') or open_output('matched'))(row)
                             matched_count += 1
                 except Exception as e:
                     logger.error(f"处理文件 {file_name} 第 {row_num} 行时出错: {e}")
                     skipped_stats['processing_error'] += 1
                     continue
-            
-            # 关闭所有输出文件
-            for handle in output_handles.values():
-                handle.close()
-            
-            # 删除空文件
-            for output_type, file_path in output_files.items():
-                if output_type == 'unmatched' and unmatched_count == 0:
-                    if os.path.exists(file_path):
-                        os.remove(file_path)
-                        logger.info(f"删除空文件 {file_path}")
-                elif output_type == 'matched' and matched_count == 0:
-                    if os.path.exists(file_path):
-                        os.remove(file_path)
-                        logger.info(f"删除空文件 {file_path}")
-            
-            return unmatched_count, matched_count, skipped_stats
+        
+        for output_type, rows in parquet_rows.items():
+            if rows:
+                write_parquet(output_files[output_type], header or [], rows_to_table(header or [], rows))
+        
+        remove_stale_outputs(output_files, unmatched_count, matched_count)
+        return unmatched_count, matched_count, skipped_stats
                 
     except Exception as e:
         logger.error(f"处理文件 {file_path} 时出错: {e}")
         raise
 
+# 工作进程中共享的参考ID，由进程池初始化函数设置一次，避免每个任务重复传递
+_worker_reference_value_set = None
+
+def _init_worker(reference_value_set):
+    """进程池初始化：保存只读的参考ID"""
+    global _worker_reference_value_set
+    _worker_reference_value_set = reference_value_set
+
+def _process_csv_file_task(file_path, output_dir, check_key_column, output_type, output_format):
+    """在工作进程中处理单个文件"""
+    return process_csv_file(file_path, None, output_dir, check_key_column, output_type,
+                            _worker_reference_value_set, output_format)
+
+def iter_csv_files(directory):
+    """逐个产出目录下的CSV文件路径，与glob的"*.csv"一致：跳过隐藏文件，Windows下不区分大小写"""
+    if not os.path.isdir(directory):
+        return
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if (not entry.name.startswith('.') and os.path.normcase(entry.name).endswith('.csv')
+                    and entry.is_file()):
+                yield entry.path
+
 def main():
     # 设置命令行参数
     parser = argparse.ArgumentParser(description='比较两个目录中CSV文件的ID，输出匹配和未匹配的数据')
@@ -145,6 +403,10 @@ def main():
     parser.add_argument('-t', '--output-type', type=str, choices=['unmatched', 'matched', 'both'],
                         default='unmatched',
                         help='输出类型：unmatched-只输出未匹配的数据，matched-只输出匹配的数据，both-同时输出匹配和未匹配的数据')
+    parser.add_argument('-f', '--output-format', type=str, choices=['csv', 'parquet'], default='csv',
+                        help='输出格式：csv-与输入相同的CSV文件，parquet-zstd压缩的Parquet文件')
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help='并行处理待检查文件的进程数，默认为CPU核数')
     
     args = parser.parse_args()
     
@@ -155,27 +417,48 @@ def main():
     reference_key_column = args.reference_key_column
     check_key_column = args.check_key_column
     output_type = args.output_type
+    output_format = args.output_format
     
     # 确保结果目录存在
     os.makedirs(output_dir, exist_ok=True)
     
     logger.info(f"正在从参考目录 {reference_dir} 中收集ID...")
-    # 收集参考目录中所有文件指定列的ID
-    reference_ids = set()
-    for file_path in glob.glob(os.path.join(reference_dir, "*.csv")):
+    # 收集参考目录中所有文件指定列的ID：整列读取的结果直接保留为PyArrow数组块，
+    # 逐行读取的ID先放入列表，最后合并后一次unique去重，不经过Python集合
+    reference_chunks = []
+    row_ids = []
+    for file_path in iter_csv_files(reference_dir):
         try:
+            try:
+                ids = collect_ids_arrow(file_path, reference_key_column)
+                if ids is not None:
+                    reference_chunks.extend(ids.chunks)
+                    continue
+            except pa.ArrowInvalid as e:
+                logger.warning(f"文件 {file_path} 无法整列解析，改为逐行读取: {e}")
             with safe_open_file(file_path, 'r', 'utf-8') as f:
                 csv_reader = csv.reader(f)
                 # 跳过头行（如果有）
                 next(csv_reader, None)
                 
                 for row in csv_reader:
-                    if row and len(row) > reference_key_column and row[reference_key_column].strip():
-                        reference_ids.add(row[reference_key_column].strip())
+                    if row and len(row) > reference_key_column:
+                        # 每行只strip一次
+                        row_id = row[reference_key_column].strip()
+                        if row_id:
+                            row_ids.append(row_id)
         except Exception as e:
             logger.error(f"处理文件 {file_path} 时出错: {e}")
     
-    logger.info(f"从参考数据中收集到 {len(reference_ids)} 个唯一ID")
+    if row_ids:
+        reference_chunks.append(pa.array(row_ids, type=pa.string()))
+        del row_ids
+    # 参考ID只构建一次PyArrow数组，供各文件的整列匹配复用
+    # 数组以连续字节存储，比Python字符串集合紧凑得多；集合仅在逐行处理时按需重建
+    reference_value_set = pc.unique(pa.chunked_array(reference_chunks, type=pa.string()))
+    del reference_chunks
+    reference_count = len(reference_value_set)
+    logger.info(f"从参考数据中收集到 {reference_count} 个唯一ID")
     
     # 创建字典，用于跟踪每个文件中匹配和未匹配的行计数
     unmatched_counts = {}
@@ -184,29 +467,54 @@ def main():
     
     # 处理待检查目录中的文件，查找匹配和未匹配的ID
     logger.info(f"正在处理待检查目录 {check_dir} 中的文件...")
-    for file_path in glob.glob(os.path.join(check_dir, "*.csv")):
+    check_files = list(iter_csv_files(check_dir))
+    results = {}
+    
+    def record_result(file_path, result):
         file_name = os.path.basename(file_path)
-        try:
-            unmatched_count, matched_count, file_skipped_stats = process_csv_file(
-                file_path, reference_ids, output_dir, check_key_column, output_type
-            )
-            
-            unmatched_counts[file_name] = unmatched_count
-            matched_counts[file_name] = matched_count
-            skipped_stats[file_name] = file_skipped_stats
-            
-            total_skipped = sum(file_skipped_stats.values())
-            logger.info(f"文件 {file_name} 处理完成: {unmatched_count} 行未匹配，{matched_count} 行匹配，{total_skipped} 行被跳过")
-            
-        except Exception as e:
-            logger.error(f"处理文件 {file_path} 时发生错误: {e}")
+        unmatched_count, matched_count, file_skipped_stats = result
+        results[file_path] = result
+        total_skipped = sum(file_skipped_stats.values())
+        logger.info(f"文件 {file_name} 处理完成: {unmatched_count} 行未匹配，{matched_count} 行匹配，{total_skipped} 行被跳过")
+    
+    # 各文件相互独立且参考ID只读，使用多进程并行处理
+    workers = min(len(check_files), args.workers or os.cpu_count() or 1)
+    if workers <= 1:
+        for file_path in check_files:
+            try:
+                record_result(file_path, process_csv_file(
+                    file_path, None, output_dir, check_key_column, output_type, reference_value_set,
+                    output_format
+                ))
+            except Exception as e:
+                logger.error(f"处理文件 {file_path} 时发生错误: {e}")
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(reference_value_set,)) as executor:
+            futures = {
+                executor.submit(_process_csv_file_task, file_path, output_dir, check_key_column, output_type,
+                                output_format): file_path
+                for file_path in check_files
+            }
+            for future in as_completed(futures):
+                file_path = futures[future]
+                try:
+                    record_result(file_path, future.result())
+                except Exception as e:
+                    logger.error(f"处理文件 {file_path} 时发生错误: {e}")
+    
+    # 按文件顺序汇总，使摘要与完成顺序无关
+    for file_path in check_files:
+        if file_path in results:
+            file_name = os.path.basename(file_path)
+            unmatched_counts[file_name], matched_counts[file_name], skipped_stats[file_name] = results[file_path]
     
     # 创建一个摘要文件
     summary_file_path = os.path.join(output_dir, "matching_summary.txt")
     with safe_open_file(summary_file_path, 'w', 'utf-8') as f:
         f.write("ID匹配统计摘要:\n")
         f.write("-" * 50 + "\n")
-        f.write(f"参考目录 ({reference_dir}) 中共有 {len(reference_ids)} 个唯一ID\n")
+        f.write(f"参考目录 ({reference_dir}) 中共有 {reference_count} 个唯一ID\n")
         f.write(f"参考数据使用列索引 {reference_key_column} 进行匹配\n")
         f.write(f"待检查目录 ({check_dir}) 使用列索引 {check_key_column} 进行匹配\n")
         f.write(f"输出类型: {output_type}\n")
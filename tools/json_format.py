@@ -12,6 +12,12 @@ from tqdm import tqdm
 import psutil
 import gc
 
+# 可选依赖：更快的JSON解析与序列化
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # 性能优化配置
 MEMORY_CHECK_INTERVAL = 100 * 1024 * 1024  # 每处理100MB检查一次内存
 MEMORY_THRESHOLD = 80  # 内存使用率警告阈值（百分数）
@@ -44,45 +50,94 @@ def setup_logging():
     )
     return logging.getLogger(__name__)
 
+def parse_json_bytes(data: bytes) -> Any:
+    """解析JSON字节串，orjson可用时直接解析bytes，失败时（如非法UTF-8）回退到标准库"""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data.decode('utf-8', errors='ignore'))
+
+def orjson_compatible(obj: Any) -> bool:
+    """检查orjson写出的文本是否与标准库一致：orjson把NaN、Infinity写为null，
+    科学计数法写为1e-7、1e16（标准库为1e-07、1e+16），含这类浮点数时需用标准库"""
+    stack = [obj]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, float):
+            # NaN与任何数比较都为False，同样判为不兼容
+            if value != 0 and not 1e-4 <= abs(value) < 1e16:
+                return False
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return True
+
+def dump_json(obj: Any, out) -> None:
+    """以2空格缩进写出JSON，orjson可用且输出与标准库一致时优先使用"""
+    if orjson is not None and orjson_compatible(obj):
+        try:
+            out.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode('utf-8'))
+            return
+        except orjson.JSONEncodeError:
+            # 如超出64位的整数，交给标准库处理
+            pass
+    json.dump(obj, out, ensure_ascii=False, indent=2)
+
 def flatten_json(obj: Dict[str, Any], parent_key: str = '', sep: str = '.') -> Dict[str, Any]:
-    """将嵌套的JSON对象拉平为单层结构"""
-    items = {}
+    """将嵌套的JSON对象拉平为单层结构（显式栈迭代，避免递归和中间字典）"""
+    result = {}
+    # 栈帧：(键前缀, 键值迭代器, 写入的目标字典, 帧结束后待拼接的列表信息)
+    stack = [(parent_key, iter(obj.items()), result, None)]
     
-    for k, v in obj.items():
-        new_key = f"{parent_key}{sep}{k}" if parent_key else k
-        
-        if isinstance(v, dict):
-            # 检查是否是数字序列键的字典
-            is_numbered_keys = all(k[-1].isdigit() for k in v.keys() if k)
-            if is_numbered_keys:
-                array_values = []
-                # 按数字排序键
-                sorted_keys = sorted(v.keys(), key=lambda x: int(''.join(filter(str.isdigit, x))))
-                for sub_k in sorted_keys:
-                    full_key = f"{new_key}.{sub_k}"
-                    array_values.append(f'{full_key}-"{str(v[sub_k])}"')
-                items[new_key] = ','.join(array_values)
-            else:
-                items.update(flatten_json(v, new_key))
-        elif isinstance(v, list):
-            if v:  # 只在列表非空时处理
-                if all(isinstance(x, dict) for x in v):
-                    array_values = []
-                    for i, item in enumerate(v):
-                        temp_dict = {f"{new_key}_{i}.{sub_k}": sub_v 
-                                   for sub_k, sub_v in item.items()}
-                        flattened = flatten_json(temp_dict)
-                        item_str = ','.join(f'{k}-"{str(v)}"' for k, v in flattened.items())
-                        array_values.append(item_str)
-                    items[new_key] = '|'.join(array_values)
-                elif all(isinstance(x, (str, int, float, bool)) for x in v):
-                    items[new_key] = '|'.join(str(x) for x in v)
+    while stack:
+        prefix, entries, items, pending = stack[-1]
+        for k, v in entries:
+            new_key = f"{prefix}{sep}{k}" if prefix else k
+            
+            if isinstance(v, dict):
+                # 检查是否是数字序列键的字典，遇到非数字结尾的键即停止
+                is_numbered_keys = True
+                for sub_k in v:
+                    if sub_k and not sub_k[-1].isdigit():
+                        is_numbered_keys = False
+                        break
+                if is_numbered_keys:
+                    # 按数字排序键
+                    sorted_keys = sorted(v.keys(), key=lambda x: int(''.join(filter(str.isdigit, x))))
+                    items[new_key] = ','.join(f'{new_key}.{sub_k}-"{str(v[sub_k])}"' for sub_k in sorted_keys)
                 else:
-                    items[new_key] = json.dumps(v, ensure_ascii=False)
+                    # 压入子字典，处理完后回到当前帧继续
+                    stack.append((new_key, iter(v.items()), items, None))
+                    break
+            elif isinstance(v, list):
+                if v:  # 只在列表非空时处理
+                    if all(isinstance(x, dict) for x in v):
+                        # 每个元素以"键_序号"为前缀展开到各自的字典，全部展开后由哨兵帧拼接
+                        item_outs = [{} for _ in v]
+                        stack.append((new_key, iter(()), None, (items, new_key, item_outs)))
+                        for i in range(len(v) - 1, -1, -1):
+                            stack.append((f"{new_key}_{i}", iter(v[i].items()), item_outs[i], None))
+                        break
+                    elif all(isinstance(x, (str, int, float, bool)) for x in v):
+                        items[new_key] = '|'.join(str(x) for x in v)
+                    else:
+                        items[new_key] = json.dumps(v, ensure_ascii=False)
+            else:
+                items[new_key] = v
         else:
-            items[new_key] = v
+            # 当前帧处理完毕
+            stack.pop()
+            if pending is not None:
+                target, key, item_outs = pending
+                target[key] = '|'.join(
+                    ','.join(f'{ik}-"{str(iv)}"' for ik, iv in item_out.items())
+                    for item_out in item_outs
+                )
             
-    return items
+    return result
 
 def find_json_objects(mm: mmap.mmap, file_size: int) -> Generator[Dict[str, Any], None, None]:
     """使用生成器模式逐个产出JSON对象"""
@@ -94,47 +149,61 @@ def find_json_objects(mm: mmap.mmap, file_size: int) -> Generator[Dict[str, Any]
         while start < len(mm):
             try:
                 # 查找下一个对象开始
-                while start < len(mm):
-                    if chr(mm[start]) == '{':
-                        break
-                    start += 1
-                    
-                if start >= len(mm):
+                start = mm.find(b'{', start)
+                if start < 0:
                     break
                     
-                # 解析JSON对象
+                # 解析JSON对象：用find直接跳到下一个花括号或引号，不再逐字节解释
                 brace_count = 0
                 pos = start
-                in_string = False
-                escape = False
+                end = len(mm)
+                next_open = next_close = next_quote = -1
                 
-                while pos < len(mm):
-                    char = chr(mm[pos])
+                while pos < end:
+                    # 只重新查找已被越过的位置，找不到时记为文件末尾
+                    if next_open < pos:
+                        next_open = mm.find(b'{', pos)
+                        if next_open < 0:
+                            next_open = end
+                    if next_close < pos:
+                        next_close = mm.find(b'}', pos)
+                        if next_close < 0:
+                            next_close = end
+                    if next_quote < pos:
+                        next_quote = mm.find(b'"', pos)
+                        if next_quote < 0:
+                            next_quote = end
+                    pos = min(next_open, next_close, next_quote)
+                    if pos >= end:
+                        break
                     
-                    if not in_string:
-                        if char == '{':
-                            brace_count += 1
-                        elif char == '}':
-                            brace_count -= 1
-                            if brace_count == 0:
-                                try:
-                                    json_str = mm[start:pos+1].decode('utf-8', errors='ignore')
-                                    json_obj = json.loads(json_str)
-                                    yield json_obj
-                                    break
-                                except json.JSONDecodeError:
-                                    logger.warning(f"JSON解析错误，位置: {start}-{pos+1}")
-                                except Exception as e:
-                                    logger.warning(f"处理错误: {str(e)}")
-                        elif char == '"':
-                            in_string = True
+                    if pos == next_open:
+                        brace_count += 1
+                    elif pos == next_close:
+                        brace_count -= 1
+                        if brace_count == 0:
+                            try:
+                                json_obj = parse_json_bytes(mm[start:pos+1])
+                                yield json_obj
+                                break
+                            except json.JSONDecodeError:
+                                logger.warning(f"JSON解析错误，位置: {start}-{pos+1}")
+                            except Exception as e:
+                                logger.warning(f"处理错误: {str(e)}")
                     else:
-                        if char == '\\':
-                            escape = not escape
-                        elif char == '"' and not escape:
-                            in_string = False
-                        else:
-                            escape = False
+                        # 跳到字符串结束的引号：前面有奇数个连续反斜杠的引号是转义的
+                        while True:
+                            pos = mm.find(b'"', pos + 1)
+                            if pos < 0:
+                                pos = end
+                                break
+                            backslash = pos - 1
+                            while mm[backslash] == 0x5C:
+                                backslash -= 1
+                            if (pos - 1 - backslash) % 2 == 0:
+                                break
+                        if pos >= end:
+                            break
                             
                     pos += 1
                 
@@ -183,7 +252,7 @@ def create_sample(input_file: str, output_file: str, sample_size: int = 1, batch
                     # 写入对象
                     if processed_count > 0:
                         out.write(',\n')
-                    json.dump(flattened_obj, out, ensure_ascii=False, indent=2)
+                    dump_json(flattened_obj, out)
                     
                     processed_count += 1
                     